@@ -0,0 +1,51 @@
+from client import database, history
+from client.database import create_transactions_table, create_users_table, history_transaction, populate_balance_cache
+from client.history import history_stats, reset_history
+from client.storage import SQLiteEngine
+from constants import Currency, Transaction
+import random
+import sys
+import tempfile
+import time
+
+'''
+Compares repeated history lookups with the history cache disabled and enabled.
+
+Run from the /src/ directory:
+    python -m benchmarks.bench_history [lookups] [users] [transactions]
+'''
+
+def main(lookups: int = 5000, users: int = 200, transactions: int = 50000) -> int:
+    directory = tempfile.mkdtemp()
+    database.storage = SQLiteEngine(f"{directory}/users.db", f"{directory}/transactions.db")
+    create_users_table()
+    create_transactions_table()
+
+    user_ids = [database.storage.insert_user(f"user{index}", f"user{index}@email.com") for index in range(users)]
+    random.seed(0)
+    database.storage.append_transactions([(random.choice(user_ids), random.choice(user_ids), Transaction.TRANSFER,
+                                           1, Currency.BITCOIN, time.time()) for _ in range(transactions)])
+    populate_balance_cache()
+
+    active_users = user_ids[:20]
+    saved_budget = history.history_budget
+
+    for name, budget in (("cache disabled", 0), ("cache enabled", saved_budget)):
+        history.history_budget = budget
+        reset_history()
+        before = history_stats()
+
+        start = time.perf_counter()
+        for index in range(lookups):
+            history_transaction(active_users[index % len(active_users)], 50)
+        elapsed = time.perf_counter() - start
+
+        stats = history_stats()
+        print(f"{name:<24} {lookups / elapsed:>10.0f} lookups/s  "
+              f"{stats['misses'] - before['misses']:>6} storage reads  {stats['hits'] - before['hits']:>6} hits")
+
+    history.history_budget = saved_budget
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,48 @@
+from client import database
+from client.database import create_transactions_table, create_users_table, deposit_transaction, insert_user, populate_balance_cache, transfer_transaction
+from client.storage import SQLiteEngine
+from concurrent.futures import ThreadPoolExecutor
+from constants import Currency
+from contextlib import redirect_stdout
+import io
+import sys
+import tempfile
+import time
+
+'''
+Compares the throughput of concurrent transfers out of one account, with and without designating it
+as a hot account.
+
+Run from the /src/ directory:
+    python -m benchmarks.bench_hot_accounts [transfers] [threads]
+'''
+
+def main(transfers: int = 2000, threads: int = 32) -> int:
+    directory = tempfile.mkdtemp()
+    database.storage = SQLiteEngine(f"{directory}/users.db", f"{directory}/transactions.db")
+
+    with redirect_stdout(io.StringIO()):
+        create_users_table()
+        create_transactions_table()
+        populate_balance_cache()
+        wallet, _ = insert_user("wallet", "wallet@email.com")
+        customers = [insert_user(f"customer{index}", f"customer{index}@email.com")[0] for index in range(10)]
+        deposit_transaction(wallet, 2 * transfers, Currency.BITCOIN)
+
+    for name, hot in (("regular account", False), ("hot account", True)):
+        if hot:
+            database.hot_accounts.add(wallet)
+
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda index: transfer_transaction(wallet, customers[index % 10], 1, Currency.BITCOIN),
+                                        range(transfers)))
+        elapsed = time.perf_counter() - start
+
+        assert all(msg is None for _, msg in results)
+        print(f"{name:<24} {transfers / elapsed:>10.0f} ops/s")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
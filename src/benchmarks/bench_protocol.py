@@ -0,0 +1,82 @@
+from client import database
+from client.database import create_transactions_table, create_users_table, insert_user, populate_balance_cache
+from client.ledger_client import LedgerClient
+from client.storage import SQLiteEngine
+from constants import API_Query, Currency, Opcode
+from contextlib import redirect_stdout
+from server import admission
+from server.app import app
+from server.binary import start_binary_server
+from threading import Thread
+from werkzeug.serving import make_server
+import http.client
+import io
+import logging
+import sys
+import tempfile
+import time
+
+'''
+Compares the throughput of deposits over the JSON query-string API and the binary protocol.
+
+Run from the /src/ directory:
+    python -m benchmarks.bench_protocol [operations]
+'''
+
+'''
+Runs a benchmark and prints its throughput.
+
+Parameters:
+- name (str): The name of the benchmark.
+- operations (int): The number of operations the benchmark performs.
+- function (Callable): The benchmark.
+'''
+def measure(name: str, operations: int, function):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {operations / elapsed:>10.0f} ops/s")
+
+def main(operations: int = 2000) -> int:
+    directory = tempfile.mkdtemp()
+    database.storage = SQLiteEngine(f"{directory}/users.db", f"{directory}/transactions.db")
+    admission.rate_limits.clear()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    with redirect_stdout(io.StringIO()):
+        create_users_table()
+        create_transactions_table()
+        populate_balance_cache()
+        user_id, _ = insert_user("bench", "bench@email.com")
+
+    http_server = make_server('localhost', 0, app, threaded=True)
+    Thread(target=http_server.serve_forever, daemon=True).start()
+    binary_server = start_binary_server(port=0)
+
+    def json_api():
+        connection = http.client.HTTPConnection('localhost', http_server.server_port)
+        for _ in range(operations):
+            connection.request("GET", f"/deposit?{API_Query.USER_ID}={user_id}&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}")
+            connection.getresponse().read()
+        connection.close()
+
+    def binary_sequential():
+        with LedgerClient(*binary_server.server_address) as client:
+            for _ in range(operations):
+                client.deposit(user_id, 1, Currency.BITCOIN)
+
+    def binary_pipelined():
+        with LedgerClient(*binary_server.server_address) as client:
+            client.pipeline([(Opcode.DEPOSIT, user_id, 1, Currency.BITCOIN)] * operations)
+
+    measure("json query-string", operations, json_api)
+    measure("binary sequential", operations, binary_sequential)
+    measure("binary pipelined", operations, binary_pipelined)
+
+    http_server.shutdown()
+    binary_server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,53 @@
+from client import database
+from client.database import create_transactions_table, create_users_table, populate_balance_cache
+from client.storage import SQLiteEngine
+from constants import Currency, Transaction
+import os
+import random
+import sys
+import tempfile
+import time
+
+'''
+Measures how replaying the transactions into the balance cache scales with the number of worker processes,
+and checks every run gives identical balances.
+
+Run from the /src/ directory:
+    python -m benchmarks.bench_replay [transactions] [users]
+'''
+
+def main(transactions: int = 500000, users: int = 1000) -> int:
+    directory = tempfile.mkdtemp()
+    database.storage = SQLiteEngine(f"{directory}/users.db", f"{directory}/transactions.db")
+    create_users_table()
+    create_transactions_table()
+
+    user_ids = [database.storage.insert_user(f"user{index}", f"user{index}@email.com") for index in range(users)]
+    random.seed(0)
+    rows = []
+    for _ in range(transactions):
+        transaction_type = random.choice(list(Transaction))
+        rows.append((random.choice(user_ids), random.choice(user_ids) if transaction_type == Transaction.TRANSFER else None,
+                     transaction_type, round(random.uniform(0, 100), 2), random.choice(list(Currency)), time.time()))
+    database.storage.append_transactions(rows)
+
+    expected = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        database.replay_workers = workers
+        database.balance_cache.clear()
+
+        start = time.perf_counter()
+        populate_balance_cache()
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = {user_id: dict(balances) for user_id, balances in database.balance_cache.items()}
+        assert database.balance_cache == expected
+        print(f"{workers:>3} workers {transactions / elapsed:>12.0f} transactions/s")
+        workers *= 2
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,63 @@
+from client import database
+from client.database import create_transactions_table, create_users_table, deposit_transaction, insert_user, populate_balance_cache, transfer_transaction
+from client.storage import MemoryEngine, SQLiteEngine
+from constants import Currency
+from contextlib import redirect_stdout
+import io
+import sys
+import tempfile
+import time
+
+'''
+Compares the SQLite and in-memory storage engines, to separate the cost of the database from the cost
+of the application.
+
+Run from the /src/ directory:
+    python -m benchmarks.bench_storage [operations]
+'''
+
+'''
+Runs a benchmark and prints its throughput.
+
+Parameters:
+- name (str): The name of the benchmark.
+- operations (int): The number of operations the benchmark performs.
+- function (Callable): The benchmark.
+'''
+def measure(name: str, operations: int, function):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {operations / elapsed:>10.0f} ops/s")
+
+def main(operations: int = 2000) -> int:
+    directory = tempfile.mkdtemp()
+    engines = {"sqlite": SQLiteEngine(f"{directory}/users.db", f"{directory}/transactions.db"),
+               "memory": MemoryEngine()}
+
+    for name, engine in engines.items():
+        database.storage = engine
+        database.balance_cache.clear()
+        with redirect_stdout(io.StringIO()):
+            create_users_table()
+            create_transactions_table()
+            populate_balance_cache()
+            user_ids = [insert_user(f"user{index}", f"user{index}@email.com")[0] for index in range(10)]
+
+        def writes():
+            for index in range(operations // 2):
+                deposit_transaction(user_ids[index % 10], 2, Currency.BITCOIN)
+                transfer_transaction(user_ids[index % 10], user_ids[(index + 1) % 10], 1, Currency.BITCOIN)
+
+        def replay():
+            database.balance_cache.clear()
+            populate_balance_cache()
+
+        measure(f"{name} writes", operations, writes)
+        measure(f"{name} replay", operations, replay)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,293 @@
+from client.replay import apply_transaction
+from constants import Currency, SQL_Statement
+from itertools import groupby, takewhile
+from threading import Event, Thread
+import gzip
+import json
+import os
+import sqlite3
+import time
+
+'''
+Event used to stop the background archiver thread.
+'''
+archiver_stop: Event = Event()
+
+'''
+Gets the path of an archive partition file. Archives are kept in an archive directory next to the
+transactions database, one gzip file per month of transactions.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- partition_name (str): The partition, as YEAR-MONTH.
+
+Returns:
+- str: The path of the partition file.
+'''
+def archive_path(filename: str, partition_name: str) -> str:
+    directory = os.path.join(os.path.dirname(os.path.abspath(filename)), "archive")
+    return os.path.join(directory, f"transactions-{partition_name}.jsonl.gz")
+
+'''
+Gets the partition a transaction is archived to.
+
+Parameters:
+- row (tuple): The transaction, with its creation time last.
+
+Returns:
+- str: The partition, as YEAR-MONTH of the creation time.
+'''
+def partition_of(row: tuple) -> str:
+    return time.strftime("%Y-%m", time.gmtime(row[-1]))
+
+'''
+Gets the id of the last archived transaction. Transactions up to it are summarized in the opening balances.
+
+Parameters:
+- cursor (sqlite3.Cursor): A cursor on the transactions database.
+
+Returns:
+- int: The transaction id, or 0 if nothing has been archived.
+'''
+def archived_through(cursor: sqlite3.Cursor) -> int:
+    cursor.execute(SQL_Statement.ARCHIVE_STATE_SELECT)
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+'''
+Loads the opening balances of every user.
+
+Parameters:
+- cursor (sqlite3.Cursor): A cursor on the transactions database.
+
+Returns:
+- dict[int, dict[Currency, float]]: The balances as of the last archived transaction, keyed by user id.
+'''
+def load_opening_balances(cursor: sqlite3.Cursor) -> dict[int, dict[Currency, float]]:
+    balances: dict[int, dict[Currency, float]] = {}
+    cursor.execute(SQL_Statement.OPENING_BALANCES_SELECT)
+    for user_id, currency_type, balance in cursor.fetchall():
+        balances.setdefault(user_id, {currency: 0 for currency in Currency})[Currency(currency_type)] = balance
+    return balances
+
+'''
+Loads the opening balances of a user.
+
+Parameters:
+- cursor (sqlite3.Cursor): A cursor on the transactions database.
+- user_id (int): The user id.
+
+Returns:
+- dict[Currency, float]: The balances as of the last archived transaction.
+'''
+def load_user_opening_balances(cursor: sqlite3.Cursor, user_id: int) -> dict[Currency, float]:
+    balances = {currency: 0 for currency in Currency}
+    cursor.execute(SQL_Statement.OPENING_BALANCES_SELECT_USER, (user_id,))
+    for currency_type, balance in cursor.fetchall():
+        balances[Currency(currency_type)] = balance
+    return balances
+
+'''
+Reads the transactions of one archive segment.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- partition_name (str): The partition holding the segment.
+- byte_offset (int): The offset of the segment in the partition file.
+- byte_length (int): The length of the segment.
+
+Returns:
+- list[tuple]: The transactions, with their creation time last.
+'''
+def read_segment(filename: str, partition_name: str, byte_offset: int, byte_length: int) -> list[tuple]:
+    with open(archive_path(filename, partition_name), "rb") as file:
+        file.seek(byte_offset)
+        data = gzip.decompress(file.read(byte_length))
+    return [tuple(json.loads(line)) for line in data.splitlines()]
+
+'''
+Reads archived transactions in a transaction id range, only decompressing the segments overlapping it.
+
+Parameters:
+- cursor (sqlite3.Cursor): A cursor on the transactions database.
+- filename (str): The name of the transactions database file.
+- after (int): The transaction id after which transactions are read.
+- upto (int): The transaction id up to which transactions are read.
+- user_id (int | None): If provided, only the transactions of this user are read.
+- limit (int | None): If provided, the maximum number of transactions to read.
+
+Returns:
+- list[tuple]: The transactions in transaction id order, with their creation time last.
+'''
+def read_archive(cursor: sqlite3.Cursor, filename: str, after: int, upto: int,
+                 user_id: int | None = None, limit: int | None = None) -> list[tuple]:
+    rows: dict[int, tuple] = {}
+
+    cursor.execute(SQL_Statement.ARCHIVE_SEGMENTS_RANGE, (after, upto))
+    for partition_name, byte_offset, byte_length in cursor.fetchall():
+        if limit is not None and len(rows) >= limit:
+            break
+        for row in read_segment(filename, partition_name, byte_offset, byte_length):
+            if after < row[0] <= upto and (user_id is None or user_id in (row[1], row[2])):
+                rows[row[0]] = row
+
+    transactions = [rows[transaction_id] for transaction_id in sorted(rows)]
+    return transactions if limit is None else transactions[:limit]
+
+'''
+Gets the id of the last archived transaction created at or before a point in time.
+
+Parameters:
+- cursor (sqlite3.Cursor): A cursor on the transactions database.
+- filename (str): The name of the transactions database file.
+- timestamp (float): The point in time, in seconds since the epoch.
+
+Returns:
+- int: The matching transaction id, or 0 if no archived transaction precedes the timestamp.
+'''
+def archived_transaction_id_at(cursor: sqlite3.Cursor, filename: str, timestamp: float) -> int:
+    transaction_id = 0
+
+    cursor.execute(SQL_Statement.ARCHIVE_SEGMENTS_AT_TIME, (timestamp,))
+    for partition_name, byte_offset, byte_length, max_transaction_id, max_created_at in cursor.fetchall():
+        if max_created_at <= timestamp:
+            transaction_id = max(transaction_id, max_transaction_id)
+            continue
+        for row in read_segment(filename, partition_name, byte_offset, byte_length):
+            if row[-1] <= timestamp:
+                transaction_id = max(transaction_id, row[0])
+
+    return transaction_id
+
+'''
+Appends transactions to their archive partitions, one compressed segment per partition.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- rows (list[tuple]): The transactions in transaction id order, with their creation time last.
+
+Returns:
+- list[tuple]: The segments written, as rows for the archive_segments table.
+'''
+def write_segments(filename: str, rows: list[tuple]) -> list[tuple]:
+    segments = []
+
+    for partition_name, partition_rows in groupby(rows, partition_of):
+        partition_rows = list(partition_rows)
+        data = gzip.compress("".join(json.dumps(list(row)) + "\n" for row in partition_rows).encode())
+
+        path = archive_path(filename, partition_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as file:
+            byte_offset = file.tell()
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        segments.append((partition_name, byte_offset, len(data),
+                         partition_rows[0][0], partition_rows[-1][0],
+                         min(row[-1] for row in partition_rows), max(row[-1] for row in partition_rows)))
+
+    return segments
+
+'''
+Archives the next chunk of transactions created before a cutoff. The transactions are appended to the archive
+files first, then rolled into the opening balances and deleted in one short database transaction, so writers
+are only blocked for the duration of that commit. The latest transaction is never archived, so transaction ids
+are not reused.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- cutoff (float): Transactions created before this point in time, in seconds since the epoch, are archived.
+- chunk_size (int): The maximum number of transactions archived.
+
+Returns:
+- int: The number of transactions archived.
+'''
+def archive_chunk(filename: str, cutoff: float, chunk_size: int) -> int:
+    with sqlite3.connect(filename) as connection:
+        cursor = connection.cursor()
+        watermark = archived_through(cursor)
+        cursor.execute(SQL_Statement.TRANSACTIONS_MAX_ID)
+        latest = cursor.fetchone()[0] or 0
+
+        cursor.execute(SQL_Statement.TRANSACTIONS_AFTER, (watermark, chunk_size))
+        rows = list(takewhile(lambda row: row[-1] < cutoff and row[0] < latest, cursor.fetchall()))
+        if not rows:
+            return 0
+
+        segments = write_segments(filename, rows)
+
+        balances: dict[int, dict[Currency, float]] = {}
+        for _, source_id, target_id, transaction_type, amount, currency_type, _ in rows:
+            for user_id in {source_id, target_id} - {None}:
+                if user_id not in balances:
+                    balances[user_id] = load_user_opening_balances(cursor, user_id)
+                apply_transaction(balances[user_id], user_id, source_id, target_id, transaction_type, amount, currency_type)
+
+        cursor.executemany(SQL_Statement.OPENING_BALANCES_UPSERT,
+                           [(user_id, currency_type, balance)
+                            for user_id, user_balances in balances.items()
+                            for currency_type, balance in user_balances.items()])
+        cursor.executemany(SQL_Statement.ARCHIVE_SEGMENTS_INSERT, segments)
+        cursor.execute(SQL_Statement.TRANSACTIONS_DELETE_RANGE, (watermark, rows[-1][0]))
+        cursor.execute(SQL_Statement.ARCHIVE_STATE_UPSERT, (rows[-1][0],))
+        connection.commit()
+
+    return len(rows)
+
+'''
+Archives every transaction created before a cutoff, one chunk at a time.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- cutoff (float): Transactions created before this point in time, in seconds since the epoch, are archived.
+- chunk_size (int): The number of transactions archived per chunk. Defaults to 1000.
+- pause (float): The number of seconds to wait between chunks. Defaults to 0.05.
+
+Returns:
+- int: The number of transactions archived.
+'''
+def archive_transactions(filename: str, cutoff: float, chunk_size: int = 1000, pause: float = 0.05) -> int:
+    total = 0
+
+    while not archiver_stop.is_set():
+        archived = archive_chunk(filename, cutoff, chunk_size)
+        if archived == 0:
+            break
+        total += archived
+        archiver_stop.wait(pause)
+
+    return total
+
+'''
+Starts the background archiver thread.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- retention_days (float): Transactions older than this many days are archived. Defaults to 365.
+- interval (float): The number of seconds between runs. Defaults to one day.
+
+Returns:
+- Thread: The started daemon thread.
+'''
+def start_archiver(filename: str, retention_days: float = 365, interval: float = 86400) -> Thread:
+    def run():
+        while not archiver_stop.wait(interval):
+            try:
+                archived = archive_transactions(filename, time.time() - retention_days * 86400)
+                if archived:
+                    print("Archived transactions:", archived)
+            except Exception as e:
+                print(e)
+
+    archiver_stop.clear()
+    thread = Thread(target=run, name="archiver", daemon=True)
+    thread.start()
+    return thread
+
+'''
+Stops the background archiver thread.
+'''
+def stop_archiver():
+    archiver_stop.set()
@@ -0,0 +1,149 @@
+from client.archive import archived_through, archived_transaction_id_at, load_user_opening_balances, read_archive
+from client.replay import apply_transaction
+from constants import Currency, SQL_Statement
+import sqlite3
+
+'''
+Persists the balances of the given users as of a transaction id.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- transaction_id (int): The transaction id the balances are valid for.
+- balances (dict[int, dict[Currency, float]]): The balances to store, keyed by user id.
+'''
+def write_checkpoint(filename: str, transaction_id: int, balances: dict[int, dict[Currency, float]]):
+    with sqlite3.connect(filename) as connection:
+        cursor = connection.cursor()
+        cursor.executemany(SQL_Statement.CHECKPOINTS_INSERT,
+                           [(transaction_id, user_id, currency_type, balance)
+                            for user_id, user_balances in balances.items()
+                            for currency_type, balance in user_balances.items()])
+        connection.commit()
+
+'''
+Gets the id of the most recent checkpoint.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+
+Returns:
+- int: The transaction id of the latest checkpoint, or 0 if none exist.
+'''
+def latest_checkpoint_id(filename: str) -> int:
+    with sqlite3.connect(filename) as connection:
+        cursor = connection.cursor()
+        cursor.execute(SQL_Statement.CHECKPOINTS_MAX_ID)
+        return cursor.fetchone()[0] or 0
+
+'''
+Gets the id of the most recent transaction.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+
+Returns:
+- int: The latest transaction id, or 0 if the ledger is empty.
+'''
+def latest_transaction_id(filename: str) -> int:
+    with sqlite3.connect(filename) as connection:
+        cursor = connection.cursor()
+        cursor.execute(SQL_Statement.TRANSACTIONS_MAX_ID)
+        return cursor.fetchone()[0] or 0
+
+'''
+Gets the id of the last transaction created at or before a point in time.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- timestamp (float): The point in time, in seconds since the epoch.
+
+Returns:
+- int: The matching transaction id, or 0 if no transaction precedes the timestamp. Archived transactions
+  are searched when none of the transactions still in the database precede it.
+'''
+def transaction_id_at(filename: str, timestamp: float) -> int:
+    with sqlite3.connect(filename) as connection:
+        cursor = connection.cursor()
+        cursor.execute("BEGIN")
+        cursor.execute(SQL_Statement.TRANSACTIONS_ID_AT_TIME, (timestamp,))
+        transaction_id = cursor.fetchone()[0]
+        if transaction_id is None:
+            transaction_id = archived_transaction_id_at(cursor, filename, timestamp)
+        return transaction_id
+
+'''
+Computes the balances of a user as of a transaction id on an open cursor. Starts from the nearest checkpoint at
+or before the transaction id, or from the opening balances if they are more recent, then replays only the user's
+transactions after it. Archived transactions are read from the archive files.
+
+Parameters:
+- cursor (sqlite3.Cursor): A cursor on the transactions database, inside a read transaction.
+- filename (str): The name of the transactions database file.
+- user_id (int): The user id for whom the balances are computed.
+- as_of (int): The transaction id up to which transactions are included.
+
+Returns:
+- dict[Currency, float]: The balances of the user for every currency.
+'''
+def replay_user(cursor: sqlite3.Cursor, filename: str, user_id: int, as_of: int) -> dict[Currency, float]:
+    balances = {currency: 0 for currency in Currency}
+    watermark = archived_through(cursor)
+
+    cursor.execute(SQL_Statement.CHECKPOINTS_LATEST, (user_id, as_of))
+    start = cursor.fetchone()[0] or 0
+
+    if as_of >= watermark and start < watermark:
+        start = watermark
+        balances = load_user_opening_balances(cursor, user_id)
+    elif start:
+        cursor.execute(SQL_Statement.CHECKPOINTS_SELECT, (user_id, start))
+        for currency_type, balance in cursor.fetchall():
+            balances[Currency(currency_type)] = balance
+
+    rows = []
+    if start < watermark:
+        rows = [row[:-1] for row in read_archive(cursor, filename, start, min(as_of, watermark), user_id)]
+    if as_of > watermark:
+        cursor.execute(SQL_Statement.TRANSACTIONS_USER_RANGE,
+                       (user_id, start, as_of, user_id, user_id, start, as_of))
+        rows.extend(cursor.fetchall())
+
+    for _, source_id, target_id, transaction_type, amount, currency_type in rows:
+        apply_transaction(balances, user_id, source_id, target_id, transaction_type, amount, currency_type)
+
+    return balances
+
+'''
+Computes the balances of a user as of a transaction id.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- user_id (int): The user id for whom the balances are computed.
+- as_of (int): The transaction id up to which transactions are included.
+
+Returns:
+- dict[Currency, float]: The balances of the user for every currency.
+'''
+def load_balance_as_of(filename: str, user_id: int, as_of: int) -> dict[Currency, float]:
+    with sqlite3.connect(filename) as connection:
+        cursor = connection.cursor()
+        cursor.execute("BEGIN")
+        return replay_user(cursor, filename, user_id, as_of)
+
+'''
+Computes the current balances of several users over a single connection.
+
+Parameters:
+- filename (str): The name of the transactions database file.
+- user_ids (list[int]): The user ids for whom the balances are computed.
+
+Returns:
+- dict[int, dict[Currency, float]]: The balances, keyed by user id.
+'''
+def load_balances(filename: str, user_ids: list[int]) -> dict[int, dict[Currency, float]]:
+    with sqlite3.connect(filename) as connection:
+        cursor = connection.cursor()
+        cursor.execute("BEGIN")
+        cursor.execute(SQL_Statement.TRANSACTIONS_MAX_ID)
+        as_of = cursor.fetchone()[0] or 0
+        return {user_id: replay_user(cursor, filename, user_id, as_of) for user_id in user_ids}
@@ -1,7 +1,11 @@
-from constants import Currency, Error_Message, Filename, SQL_Statement, Table, Transaction 
-from pprint import pprint
-from threading import Lock
-import sqlite3
+from client.events import publish_event, reset_events
+from client.history import get_history, put_history, record_history, reset_history
+from client.replay import apply_to_ledger
+from client.storage import SQLiteEngine, StorageEngine
+from constants import API_Query, Currency, Error_Message, Filename, Transaction 
+from threading import Event, Lock, Thread
+import math
+import time
 
 '''
 Stores in-memory calcualtion of user balances
@@ -14,45 +18,76 @@ Mutex lock when accessing the balance cache
 cache_mutex: Lock = Lock()
 
 '''
-Database filenames. Implemented to resolve unit testing overwrite bugs.
+Set once every user's balances have been loaded into the cache. Until then, users missing
+from the cache may not have been loaded yet, rather than not exist.
+'''
+cache_ready: Event = Event()
 
-TODO:  Improve on solution to discrimiante based on when live or testing. 
-On first glance, it seems redundant.
 '''
-db_files: dict[Table, Filename] = {Table.USERS: Filename.USERS_DB_FILENAME,
-                                   Table.TRANSACTIONS: Filename.TRANSACTIONS_DB_FILENAME}
+Progress of loading the balance cache. Holds the error of the last attempt while a failed warm-up is being retried.
+'''
+warmup_progress: dict[API_Query, int | str] = {API_Query.LOADED_USERS: 0, API_Query.TOTAL_USERS: 0}
 
+'''
+Seconds to wait before retrying a failed warm-up. The wait doubles after each failure, up to warmup_retry_limit.
+'''
+warmup_retry_delay: float = 1.0
+warmup_retry_limit: float = 60.0
 
 '''
-Creates a table in the SQLite database using the provided filename and SQL statement.
+Storage engine holding the users and transactions. Defaults to the SQLite database files; tests and benchmarks
+may replace it, for example with a MemoryEngine, before creating the tables.
+'''
+storage: StorageEngine = SQLiteEngine(Filename.USERS_DB_FILENAME, Filename.TRANSACTIONS_DB_FILENAME)
 
-Parameters:
-- filename (str): The name of the SQLite database file.
-- sql_statement (str): The SQL statement to create the table.
 '''
-def create_table(filename: str, sql_statement: str):
-    try:
-        with sqlite3.connect(filename) as connection:
-            cursor = connection.cursor()
-            cursor.execute(sql_statement)
-            connection.commit()
-    except sqlite3.Error as e:
-        print(e)
+Number of transactions between balance checkpoints. A value of 0 disables checkpointing.
+'''
+checkpoint_interval: int = 1000
 
 '''
-Drops a table from the SQLite database using the provided filename and SQL statement.
+Users whose balances changed since the last checkpoint. Guarded by the cache mutex.
+'''
+checkpoint_dirty: set[int] = set()
 
-Parameters:
-- filename (str): The name of the SQLite database file.
-- sql_statement (str): The SQL statement to drop the table.
 '''
-def drop_table(filename: str, sql_statement: str):
-    try:
-        with sqlite3.connect(filename) as connection:
-            cursor = connection.cursor()
-            cursor.execute(sql_statement)
-    except sqlite3.Error as e:
-        print(e)
+Number of worker processes used to replay the transactions when loading the balance cache. With 1, the
+transactions are replayed in this process, and the warm-up loads users from their checkpoints instead. Either way
+they are applied in transaction id order, so the balances are identical. Set from LEDGER_REPLAY_WORKERS by main.py.
+'''
+replay_workers: int = 1
+
+'''
+Number of transaction ids replayed per chunk by each replay worker.
+'''
+replay_chunk_size: int = 100000
+
+'''
+User ids of hot accounts, such as exchange wallets, that are party to most transfers. Transfers involving a
+hot account are committed in groups rather than one database transaction each.
+'''
+hot_accounts: set[int] = set()
+
+'''
+Maximum number of transfers committed in one group.
+'''
+hot_batch_size: int = 256
+
+'''
+Transfers involving a hot account waiting to be committed, each as [arguments, result]. Guarded by hot_queue_mutex.
+'''
+hot_queue: list[list] = []
+
+'''
+Mutex lock when accessing the hot account transfer queue
+'''
+hot_queue_mutex: Lock = Lock()
+
+'''
+Held by the thread committing a group of hot account transfers.
+'''
+hot_commit_mutex: Lock = Lock()
+
 
 '''
 Inserts a new user into the users database with the provided username and email.
@@ -69,17 +104,12 @@ def insert_user(username: str, email: str) -> tuple[int, str]:
     msg: str = None
 
     try:
-        with sqlite3.connect(db_files[Table.USERS]) as connection:
-            cursor = connection.cursor()
-            cursor.execute(SQL_Statement.USERS_INSERT, (username, email))
-            connection.commit()
-            id = cursor.lastrowid
+        id = storage.insert_user(username, email)
 
         with cache_mutex:
             balance_cache[id] = {currency: 0 for currency in Currency}
 
-        print("Cache:")
-        pprint(balance_cache)
+        print_cache()
     except Exception as e:
         print(e)
         msg = str(e)
@@ -98,24 +128,26 @@ Returns:
 - tuple[int, str]: A tuple containing the transaction id and a potential error message.
 '''
 def deposit_transaction(user_id: int, amount: float, currency_type: Currency) -> tuple[int, str]:
+    if not finite_amount(amount):
+        return None, Error_Message.INVALID_AMOUNT
+
     id: int = None
     msg: str = None
 
     try:
         with cache_mutex:
             if user_id not in balance_cache:
-                raise Exception(Error_Message.INVALID_SOURCE_USER)
+                raise Exception(missing_user_error(Error_Message.INVALID_SOURCE_USER))
             
-            with sqlite3.connect(db_files[Table.TRANSACTIONS]) as connection:
-                cursor = connection.cursor()
-                cursor.execute(SQL_Statement.TRANSACTIONS_DEPOSIT, (user_id, amount, currency_type))
-                connection.commit()
-                id = cursor.lastrowid
+            created_at = time.time()
+            id = storage.append_transactions([(user_id, None, Transaction.DEPOSIT, amount, currency_type, created_at)])[0]
 
             balance_cache[user_id][currency_type] = balance_cache[user_id].get(currency_type, 0) + amount
+            record_checkpoint(id, user_id)
+            publish_event(id, user_id, None, Transaction.DEPOSIT, amount, currency_type, created_at)
+            record_history((id, user_id, None, Transaction.DEPOSIT, amount, currency_type, created_at))
 
-        print("Cache:")
-        pprint(balance_cache)
+        print_cache()
     except Exception as e:
         print(e)
         msg = str(e)
@@ -135,38 +167,127 @@ Returns:
 - tuple[int, str]: A tuple containing the transaction id and a potential error message.
 '''
 def transfer_transaction(source_id: int, target_id: int, amount: float, currency_type: Currency) -> tuple[int, str]:
+    if not finite_amount(amount):
+        return None, Error_Message.INVALID_AMOUNT
+    if source_id in hot_accounts or target_id in hot_accounts:
+        return batch_transfer_transaction(source_id, target_id, amount, currency_type)
+
     id: int = None
     msg: str = None
 
     try:
         with cache_mutex:
             if source_id not in balance_cache:
-                raise Exception(Error_Message.INVALID_SOURCE_USER)
+                raise Exception(missing_user_error(Error_Message.INVALID_SOURCE_USER))
             if target_id not in balance_cache:
-                raise Exception(Error_Message.INVALID_TARGET_USER)
+                raise Exception(missing_user_error(Error_Message.INVALID_TARGET_USER))
 
             current_balance = balance_cache[source_id][currency_type]
 
             if current_balance < amount:
                 raise Exception(Error_Message.INSUFFICIENT_FUNDS_TRANSFER)
             
-            with sqlite3.connect(db_files[Table.TRANSACTIONS]) as connection:
-                cursor = connection.cursor()
-                cursor.execute(SQL_Statement.TRANSACTIONS_TRANSFER, (source_id, target_id, amount, currency_type))
-                connection.commit()
-                id = cursor.lastrowid
+            created_at = time.time()
+            id = storage.append_transactions([(source_id, target_id, Transaction.TRANSFER, amount, currency_type, created_at)])[0]
 
             balance_cache[source_id][currency_type] = balance_cache[source_id].get(currency_type, 0) - amount
             balance_cache[target_id][currency_type] = balance_cache[target_id].get(currency_type, 0) + amount
+            record_checkpoint(id, source_id, target_id)
+            publish_event(id, source_id, target_id, Transaction.TRANSFER, amount, currency_type, created_at)
+            record_history((id, source_id, target_id, Transaction.TRANSFER, amount, currency_type, created_at))
 
-        print("Cache:")
-        pprint(balance_cache)
+        print_cache()
     except Exception as e:
         print(e)
         msg = str(e)
         
     return id, msg
 
+'''
+Transfers between two users, at least one of them a hot account. The transfer is queued, and whichever waiting
+thread next takes hot_commit_mutex commits every queued transfer in one database transaction, so concurrent
+transfers on a hot account share a commit instead of each waiting for their own.
+
+Parameters:
+- Same as transfer_transaction.
+
+Returns:
+- tuple[int, str]: A tuple containing the transaction id and a potential error message.
+'''
+def batch_transfer_transaction(source_id: int, target_id: int, amount: float, currency_type: Currency) -> tuple[int, str]:
+    request = [(source_id, target_id, amount, currency_type), None]
+    with hot_queue_mutex:
+        hot_queue.append(request)
+
+    while request[1] is None:
+        with hot_commit_mutex:
+            if request[1] is None:
+                with hot_queue_mutex:
+                    batch = hot_queue[:hot_batch_size]
+                    del hot_queue[:hot_batch_size]
+                commit_transfers(batch)
+                print_cache()
+
+    return request[1]
+
+'''
+Commits a group of transfers in one database transaction, while holding the cache mutex. Each transfer is checked
+against the balances left by the transfers before it in the group, so the overdraft guarantee is the same as for
+transfer_transaction. A transfer that fails its checks only fails itself; the rest of the group is still committed.
+The cache is only updated once the group is committed.
+
+Parameters:
+- batch (list[list]): The queued transfers, each as [arguments, result]. Their result is set to the
+  (transaction id, error message) tuple.
+'''
+def commit_transfers(batch: list[list]):
+    accepted: list[list] = []
+    balances: dict[tuple[int, Currency], float] = {}
+
+    try:
+        with cache_mutex:
+            created_at = time.time()
+            for request in batch:
+                source_id, target_id, amount, currency_type = request[0]
+                if currency_type not in list(Currency):
+                    request[1] = (None, Error_Message.INVALID_CURRENCY)
+                    continue
+                if source_id not in balance_cache:
+                    request[1] = (None, missing_user_error(Error_Message.INVALID_SOURCE_USER))
+                    continue
+                if target_id not in balance_cache:
+                    request[1] = (None, missing_user_error(Error_Message.INVALID_TARGET_USER))
+                    continue
+
+                source_balance = balances.get((source_id, currency_type), balance_cache[source_id][currency_type])
+                if source_balance < amount:
+                    request[1] = (None, Error_Message.INSUFFICIENT_FUNDS_TRANSFER)
+                    continue
+
+                balances[(source_id, currency_type)] = source_balance - amount
+                balances[(target_id, currency_type)] = balances.get((target_id, currency_type),
+                                                                    balance_cache[target_id][currency_type]) + amount
+                accepted.append(request)
+
+            ids = storage.append_transactions([(source_id, target_id, Transaction.TRANSFER, amount, currency_type, created_at)
+                                               for (source_id, target_id, amount, currency_type), _ in accepted])
+            committed = list(zip(ids, accepted))
+
+            for (user_id, currency), balance in balances.items():
+                balance_cache[user_id][currency] = balance
+            for id, request in committed:
+                source_id, target_id, amount, currency_type = request[0]
+                publish_event(id, source_id, target_id, Transaction.TRANSFER, amount, currency_type, created_at)
+                record_history((id, source_id, target_id, Transaction.TRANSFER, amount, currency_type, created_at))
+                request[1] = (id, None)
+            if committed:
+                record_checkpoint(committed[-1][0], *{user_id for user_id, _ in balances}, first_id=committed[0][0])
+    except Exception as e:
+        print(e)
+        for request in batch:
+            if request[1] is None:
+                request[1] = (None, str(e))
+
 '''
 Get the balance of a user and currency type, or all currencies.
 
@@ -180,11 +301,104 @@ Returns:
 def balance_transaction(user_id: int, currency_type: Currency | None) -> tuple[dict[Currency, float], str]:
     with cache_mutex:
         if user_id not in balance_cache:
-            return None, Error_Message.INVALID_SOURCE_USER
+            return None, missing_user_error(Error_Message.INVALID_SOURCE_USER)
         if currency_type is None:
             return balance_cache[user_id], None
         return {currency_type: balance_cache[user_id][currency_type]}, None
 
+'''
+Get the balance of a user and currency type, or all currencies, as of a past transaction id or point in time.
+Loads the nearest checkpoint and replays only the transactions after it.
+
+Parameters:
+- user_id (int): The user id for whom the balance is retrieved.
+- currency_type (Currency | None): The type of currency for which the balance is retrieved. If None, retrieves balances for all currency types.
+- as_of (int | None): The transaction id up to which transactions are included.
+- as_of_time (float | None): The point in time, in seconds since the epoch, up to which transactions are included. Used when as_of is None.
+
+Returns:
+- tuple[dict[Currency, float], int, str]: A tuple containing the balance data, the resolved transaction id, and a potential error message.
+'''
+def balance_as_of_transaction(user_id: int, currency_type: Currency | None, as_of: int | None,
+                              as_of_time: float | None) -> tuple[dict[Currency, float], int, str]:
+    with cache_mutex:
+        if user_id not in balance_cache:
+            return None, None, missing_user_error(Error_Message.INVALID_SOURCE_USER)
+
+    try:
+        if as_of is None:
+            as_of = storage.transaction_id_at(as_of_time)
+        elif as_of < 0 or as_of > storage.latest_transaction_id():
+            return None, None, Error_Message.INVALID_AS_OF
+
+        balances = storage.load_balances([user_id], as_of)[user_id]
+    except Exception as e:
+        print(e)
+        return None, None, str(e)
+
+    if currency_type is None:
+        return balances, as_of, None
+    return {currency_type: balances[currency_type]}, as_of, None
+
+'''
+Get the transactions of a user, oldest first. Served from the history cache when possible. On a miss, the
+transactions are read from the storage engine without holding the cache mutex, which is then only held to read
+the few transactions committed in the meantime and cache the result, so it stays in step with the write functions.
+
+Parameters:
+- user_id (int): The user id for whom the transactions are retrieved.
+- limit (int | None): If provided, only the most recent transactions are retrieved. Must be positive.
+
+Returns:
+- tuple[list[tuple], str]: A tuple containing the transactions, and a potential error message.
+'''
+def history_transaction(user_id: int, limit: int | None = None) -> tuple[list[tuple], str]:
+    if limit is not None and limit <= 0:
+        return None, Error_Message.INVALID_LIMIT
+
+    with cache_mutex:
+        if user_id not in balance_cache:
+            return None, missing_user_error(Error_Message.INVALID_SOURCE_USER)
+
+    rows = get_history(user_id, limit)
+    if rows is not None:
+        return rows, None
+
+    try:
+        loaded_through = storage.latest_transaction_id()
+        rows = storage.user_transactions(user_id, 0, loaded_through)
+        with cache_mutex:
+            rows.extend(storage.user_transactions(user_id, loaded_through))
+            put_history(user_id, rows)
+    except Exception as e:
+        print(e)
+        return None, str(e)
+
+    return (rows[-limit:] if limit else rows), None
+
+'''
+Marks users as changed since the last checkpoint, and writes a checkpoint of their balances
+every checkpoint_interval transactions. Must be called while holding the cache mutex.
+
+Parameters:
+- transaction_id (int): The id of the transaction that was just committed.
+- user_ids (int): The user ids whose balances were changed by the transaction.
+- first_id (int | None): For a group of transactions committed together, the id of the first one. The checkpoint
+  is then written at transaction_id if the group spans a multiple of checkpoint_interval.
+'''
+def record_checkpoint(transaction_id: int, *user_ids: int, first_id: int | None = None):
+    checkpoint_dirty.update(user_ids)
+    first_id = transaction_id if first_id is None else first_id
+    if checkpoint_interval <= 0 or transaction_id // checkpoint_interval == (first_id - 1) // checkpoint_interval:
+        return
+
+    try:
+        storage.write_checkpoint(transaction_id,
+                                 {user_id: balance_cache[user_id] for user_id in checkpoint_dirty if user_id in balance_cache})
+        checkpoint_dirty.clear()
+    except Exception as e:
+        print(e)
+
 '''
 Withdraws a transaction for a user. Store operation in the transactions database.
 
@@ -197,29 +411,31 @@ Returns:
 - tuple[int, str]: A tuple containing the transaction id and a potential error message.
 '''
 def withdraw_transaction(user_id: int, amount: float, currency_type: Currency) -> tuple[int, str]:
+    if not finite_amount(amount):
+        return None, Error_Message.INVALID_AMOUNT
+
     id: int = None
     msg: str = None
 
     try:
         with cache_mutex:
             if user_id not in balance_cache:
-                raise Exception(Error_Message.INVALID_SOURCE_USER)
+                raise Exception(missing_user_error(Error_Message.INVALID_SOURCE_USER))
 
             current_balance = balance_cache[user_id][currency_type]
 
             if current_balance < amount:
                 raise Exception(Error_Message.INSUFFICIENT_FUNDS_WITHDRAW)
             
-            with sqlite3.connect(db_files[Table.TRANSACTIONS]) as connection:            
-                cursor = connection.cursor()
-                cursor.execute(SQL_Statement.TRANSACTIONS_DEPOSIT, (user_id, amount, currency_type))
-                connection.commit()
-                id = cursor.lastrowid
+            created_at = time.time()
+            id = storage.append_transactions([(user_id, None, Transaction.WITHDRAW, amount, currency_type, created_at)])[0]
 
             balance_cache[user_id][currency_type] = balance_cache[user_id].get(currency_type, 0) - amount
+            record_checkpoint(id, user_id)
+            publish_event(id, user_id, None, Transaction.WITHDRAW, amount, currency_type, created_at)
+            record_history((id, user_id, None, Transaction.WITHDRAW, amount, currency_type, created_at))
 
-        print("Cache:")
-        pprint(balance_cache)
+        print_cache()
     except Exception as e:
         print(e)
         msg = str(e)
@@ -233,9 +449,8 @@ Parameters:
 - testing (bool): A flag indicating whether the function is being used for testing purposes. Defaults to False.
 '''
 def create_users_table(testing: bool = False):
-    if testing:
-        db_files[Table.USERS] = Filename.TEST_USERS_DB_FILENAME
-    create_table(db_files[Table.USERS], SQL_Statement.USERS_CREATE_TABLE)
+    use_test_storage(testing)
+    storage.create_users_table()
 
 '''
 Creates the transacations table.
@@ -244,72 +459,197 @@ Parameters:
 - testing (bool): A flag indicating whether the function is being used for testing purposes. Defaults to False.
 '''
 def create_transactions_table(testing: bool = False):
+    use_test_storage(testing)
+    storage.create_transactions_table()
+
+'''
+Switches to the SQLite test database files.
+
+Parameters:
+- testing (bool): Whether to switch. Does nothing if False.
+'''
+def use_test_storage(testing: bool):
+    global storage
+
     if testing:
-        db_files[Table.TRANSACTIONS] = Filename.TEST_TRANSACTIONS_DB_FILENAME
-    create_table(db_files[Table.TRANSACTIONS], SQL_Statement.TRANSACTIONS_CREATE_TABLE)
+        storage = SQLiteEngine(Filename.TEST_USERS_DB_FILENAME, Filename.TEST_TRANSACTIONS_DB_FILENAME)
 
 '''
 Drops the users table.
 '''
 def drop_users_table():
-    drop_table(db_files[Table.USERS], SQL_Statement.USERS_DROP_TABLE)
+    storage.drop_users_table()
 
 '''
 Drops the transacations table.
 '''
 def drop_transactions_table():
-    drop_table(db_files[Table.TRANSACTIONS], SQL_Statement.TRANSACTIONS_DROP_TABLE)
+    storage.drop_transactions_table()
+    checkpoint_dirty.clear()
+    reset_events(0)
+    reset_history()
 
 '''
-Populates the balance cache with transaction data from the transactions database.
+Replays the balances of every user from the opening balances and every transaction after them. With more than one
+replay worker, the transactions are replayed by a pool of processes, whose module is only imported then, as it
+loads multiprocessing.
+
+Parameters:
+- user_ids (list[int]): The user ids whose balances are replayed.
+- upto (int): The transaction id up to which transactions are replayed.
+
+Returns:
+- dict[int, dict[Currency, float]]: The balances, keyed by user id.
 '''
-def populate_balance_cache():
-    rows = []
+def replay_balances(user_ids: list[int], upto: int) -> dict[int, dict[Currency, float]]:
+    balances = {user_id: {currency: 0 for currency in Currency} for user_id in user_ids}
+
+    watermark, opening_balances = storage.opening_balances()
+    for user_id, user_balances in opening_balances.items():
+        balances.setdefault(user_id, {currency: 0 for currency in Currency}).update(user_balances)
+
+    if replay_workers > 1:
+        from client.parallel_replay import replay_transactions
+
+        replay_transactions(storage, balances, watermark, upto, replay_workers, replay_chunk_size)
+    else:
+        for row in storage.scan_transactions(watermark, upto):
+            apply_to_ledger(balances, row)
+
+    return balances
 
+'''
+Populates the balance cache from the storage engine, replaying the opening balances and every transaction
+after them while holding the cache mutex.
+'''
+def populate_balance_cache():
     try:
         with cache_mutex:
-            with sqlite3.connect(db_files[Table.USERS]) as connection:
-                cursor = connection.cursor()
-                cursor.execute(SQL_Statement.USERS_SELECT)
-                rows = cursor.fetchall()
-                
-                for row in rows:
-                    user_id = int(row[0])
-                    balance_cache[user_id] = {currency: 0 for currency in Currency}
-                
-
-            with sqlite3.connect(db_files[Table.TRANSACTIONS]) as connection:
-                cursor = connection.cursor()
-                cursor.execute(SQL_Statement.TRANSACTIONS_SELECT)
-                rows = cursor.fetchall()
-
-                for transaction_id, source_id, target_id, transaction_type, amount, currency_type in rows:
-                    transaction_id = int(transaction_id)
-                    source_id = int(source_id)
-                    if target_id is not None:
-                        target_id = int(target_id)
-                    amount = float(amount)
-
-                    print(transaction_id, source_id, target_id, transaction_type, amount, currency_type)
-
-                    if transaction_type == Transaction.DEPOSIT:
-                        if source_id not in balance_cache:
-                            balance_cache[source_id] = {currency: 0 for currency in Currency}
-                        balance_cache[source_id][currency_type] = balance_cache[source_id].get(currency_type, 0) + amount
-                    elif transaction_type == Transaction.WITHDRAW:
-                        if source_id not in balance_cache:
-                            balance_cache[source_id] = {currency: 0 for currency in Currency}
-                        balance_cache[source_id][currency_type] = balance_cache[source_id].get(currency_type, 0) - amount
-                    elif transaction_type == Transaction.TRANSFER:
-                        if source_id not in balance_cache:
-                            balance_cache[source_id] = {currency: 0 for currency in Currency}
-                        if target_id not in balance_cache:
-                            balance_cache[target_id] = {currency: 0 for currency in Currency}
-                        balance_cache[source_id][currency_type] = balance_cache[source_id].get(currency_type, 0) - amount
-                        balance_cache[target_id][currency_type] = balance_cache[target_id].get(currency_type, 0) + amount
-
-        print("Cache:")
-        pprint(balance_cache)
+            latest_id = storage.latest_transaction_id()
+            balance_cache.update(replay_balances(storage.user_ids(), latest_id))
+
+            reset_events(latest_id)
+            finish_cache_load()
     except Exception as e:
         print(e)
 
+'''
+Loads the balance cache in the background, one batch of users at a time, while the server is accepting requests.
+Each batch is loaded from the nearest checkpoints while holding the cache mutex, so users in the cache are always
+up to date. Requests for users not loaded yet get a warming up error. Errors are raised to the caller; users
+loaded before the error stay in the cache and are skipped when it is called again.
+
+With more than one replay worker, the whole ledger is replayed in parallel instead, up to the latest transaction
+when the warm-up starts and without holding the cache mutex. Users not in the cache cannot take part in a later
+transaction, so the replayed balances are still up to date when they are loaded, all at once. Users already in the
+cache, such as ones created while warming up, are kept.
+
+Parameters:
+- batch_size (int): The number of users loaded per batch. Defaults to 500.
+'''
+def warm_balance_cache(batch_size: int = 500):
+    user_ids = storage.user_ids()
+
+    warmup_progress[API_Query.LOADED_USERS] = 0
+    warmup_progress[API_Query.TOTAL_USERS] = len(user_ids)
+
+    if replay_workers > 1:
+        balances = replay_balances(user_ids, storage.latest_transaction_id())
+        with cache_mutex:
+            for user_id, user_balances in balances.items():
+                balance_cache.setdefault(user_id, user_balances)
+            finish_cache_load()
+        return
+
+    for index in range(0, len(user_ids), batch_size):
+        with cache_mutex:
+            batch = [user_id for user_id in user_ids[index:index + batch_size] if user_id not in balance_cache]
+            balance_cache.update(storage.load_balances(batch))
+        warmup_progress[API_Query.LOADED_USERS] += len(user_ids[index:index + batch_size])
+
+    with cache_mutex:
+        finish_cache_load()
+
+'''
+Loads the balance cache, retrying until it succeeds. After each failure the error is shown by the readiness
+endpoint and the next attempt waits twice as long, starting at warmup_retry_delay and up to warmup_retry_limit.
+
+Parameters:
+- batch_size (int): The number of users loaded per batch.
+'''
+def retry_cache_warmup(batch_size: int):
+    delay = warmup_retry_delay
+    while True:
+        try:
+            warm_balance_cache(batch_size)
+            return
+        except Exception as e:
+            print(e)
+            warmup_progress[API_Query.ERROR] = str(e)
+            time.sleep(delay)
+            delay = min(delay * 2, warmup_retry_limit)
+
+'''
+Starts loading the balance cache in a background thread. The event feed is reset first, so transactions
+committed before the restart are served from storage while the cache is still loading.
+
+Parameters:
+- batch_size (int): The number of users loaded per batch. Defaults to 500.
+
+Returns:
+- Thread: The started daemon thread.
+'''
+def start_cache_warmup(batch_size: int = 500) -> Thread:
+    with cache_mutex:
+        reset_events(storage.latest_transaction_id())
+        cache_ready.clear()
+    thread = Thread(target=retry_cache_warmup, args=(batch_size,), name="cache-warmup", daemon=True)
+    thread.start()
+    return thread
+
+'''
+Completes loading the balance cache. Resets the history cache, marks the users changed since the last checkpoint,
+clears any warm-up error, and flags the cache as ready. Must be called while holding the cache mutex.
+'''
+def finish_cache_load():
+    reset_history()
+    checkpoint_dirty.update(storage.users_since_checkpoint())
+
+    warmup_progress.pop(API_Query.ERROR, None)
+    warmup_progress[API_Query.LOADED_USERS] = len(balance_cache)
+    warmup_progress[API_Query.TOTAL_USERS] = len(balance_cache)
+    cache_ready.set()
+
+'''
+Checks that the amount of a transaction is a finite number. A NaN or infinite amount would leave every balance
+it is added to NaN or infinite for good.
+
+Parameters:
+- amount (float): The amount of the transaction.
+
+Returns:
+- bool: Whether the amount is valid.
+'''
+def finite_amount(amount: float) -> bool:
+    return isinstance(amount, (int, float)) and math.isfinite(amount)
+
+'''
+Gets the error for a user that is not in the balance cache.
+
+Parameters:
+- message (Error_Message): The error to report once the cache is ready.
+
+Returns:
+- Error_Message: The given error, or a warming up error while the cache is still loading.
+'''
+def missing_user_error(message: Error_Message) -> Error_Message:
+    return message if cache_ready.is_set() else Error_Message.CACHE_WARMING
+
+'''
+Prints the balance cache, for debugging.
+'''
+def print_cache():
+    from pprint import pprint
+
+    print("Cache:")
+    pprint(balance_cache)
@@ -0,0 +1,114 @@
+from client.storage import StorageEngine
+from collections import deque
+from constants import API_Query
+from threading import Condition
+import time
+
+'''
+Bounded ring buffer of the most recently committed ledger operations, in transaction id order.
+'''
+event_buffer: deque[dict] = deque(maxlen=10000)
+
+'''
+Transaction id of the newest operation that is no longer in the buffer. Consumers whose cursor is
+older than this are served from the storage engine instead.
+'''
+event_floor: int = 0
+
+'''
+Condition used to wake long-polling consumers when an operation is published.
+'''
+event_condition: Condition = Condition()
+
+'''
+Builds an event from a transaction.
+
+Parameters:
+- transaction_id (int): The transaction id.
+- source_id (int): The source user id.
+- target_id (int | None): The target user id, for transfers.
+- transaction_type (str): The type of the transaction.
+- amount (float): The amount of the transaction.
+- currency_type (str): The currency of the transaction.
+- created_at (float): When the transaction was created, in seconds since the epoch.
+
+Returns:
+- dict: The event.
+'''
+def make_event(transaction_id: int, source_id: int, target_id: int | None, transaction_type: str,
+               amount: float, currency_type: str, created_at: float) -> dict:
+    return {API_Query.TRANSACTION_ID: transaction_id,
+            API_Query.TRANSACTION_TYPE: transaction_type,
+            API_Query.SOURCE_USER_ID: source_id,
+            API_Query.TARGET_USER_ID: target_id,
+            API_Query.AMOUNT: amount,
+            API_Query.CURRENCY_TYPE: currency_type,
+            API_Query.CREATED_AT: created_at}
+
+'''
+Publishes a committed operation to the buffer and wakes waiting consumers. Must be called in
+transaction id order, which the cache mutex guarantees for the write functions.
+
+Parameters:
+- Same as make_event.
+'''
+def publish_event(transaction_id: int, source_id: int, target_id: int | None, transaction_type: str,
+                  amount: float, currency_type: str, created_at: float):
+    global event_floor
+
+    event = make_event(transaction_id, source_id, target_id, transaction_type, amount, currency_type, created_at)
+    with event_condition:
+        if len(event_buffer) == event_buffer.maxlen:
+            event_floor = event_buffer[0][API_Query.TRANSACTION_ID]
+        event_buffer.append(event)
+        event_condition.notify_all()
+
+'''
+Empties the buffer.
+
+Parameters:
+- floor (int): The transaction id of the latest operation already committed.
+- size (int | None): The new capacity of the buffer. If None, the capacity is unchanged.
+'''
+def reset_events(floor: int, size: int | None = None):
+    global event_buffer, event_floor
+
+    with event_condition:
+        event_buffer = deque(maxlen=size or event_buffer.maxlen)
+        event_floor = floor
+
+'''
+Reads the events committed after a cursor. Served from the buffer when the cursor is recent enough, otherwise
+from the storage engine. If there are no newer events, waits for one to be published.
+
+Parameters:
+- storage (StorageEngine): The storage engine holding the transactions.
+- after (int): The transaction id after which events are read.
+- limit (int): The maximum number of events to return.
+- timeout (float): The maximum number of seconds to wait for a new event.
+
+Returns:
+- list[dict]: The events, in transaction id order. Empty if the wait timed out.
+'''
+def read_events(storage: StorageEngine, after: int, limit: int, timeout: float) -> list[dict]:
+    deadline = time.monotonic() + timeout
+
+    with event_condition:
+        while True:
+            if after < event_floor:
+                break
+
+            events = []
+            for event in reversed(event_buffer):
+                if event[API_Query.TRANSACTION_ID] <= after:
+                    break
+                events.append(event)
+            if events:
+                events.reverse()
+                return events[:limit]
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not event_condition.wait(remaining):
+                return []
+
+    return [make_event(*row) for row in storage.scan_transactions(after, limit=limit)]
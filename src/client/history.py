@@ -0,0 +1,136 @@
+from collections import OrderedDict
+from constants import API_Query
+from threading import Lock
+import sys
+
+'''
+Maximum number of bytes of transactions kept in the history cache. A value of 0 disables the cache.
+'''
+history_budget: int = 32 << 20
+
+'''
+Cached transaction lists, keyed by user id, least recently read first. Guarded by history_mutex.
+'''
+history_cache: OrderedDict[int, list[tuple]] = OrderedDict()
+
+'''
+Estimated size in bytes of each cached transaction list, and of all of them. Guarded by history_mutex.
+'''
+history_sizes: dict[int, int] = {}
+history_bytes: int = 0
+
+'''
+History cache counters. Guarded by history_mutex.
+'''
+history_counters: dict[API_Query, int] = {API_Query.HITS: 0, API_Query.MISSES: 0, API_Query.EVICTIONS: 0}
+
+'''
+Mutex lock when accessing the history cache
+'''
+history_mutex: Lock = Lock()
+
+'''
+Estimates the memory used by a cached transaction.
+
+Parameters:
+- row (tuple): The transaction.
+
+Returns:
+- int: The estimated size in bytes, counting the tuple, its fields, and its slot in the list.
+'''
+def row_size(row: tuple) -> int:
+    return sys.getsizeof(row) + sum(sys.getsizeof(field) for field in row) + 8
+
+'''
+Gets the cached transactions of a user, and marks them as recently used.
+
+Parameters:
+- user_id (int): The user id.
+- limit (int | None): If provided, only the most recent transactions are returned.
+
+Returns:
+- list[tuple] | None: A copy of the transactions in transaction id order, or None if the user is not cached.
+'''
+def get_history(user_id: int, limit: int | None = None) -> list[tuple] | None:
+    with history_mutex:
+        if user_id not in history_cache:
+            history_counters[API_Query.MISSES] += 1
+            return None
+
+        history_counters[API_Query.HITS] += 1
+        history_cache.move_to_end(user_id)
+        rows = history_cache[user_id]
+        return rows[-limit:] if limit else list(rows)
+
+'''
+Caches the transactions of a user, evicting the least recently used users to stay within the budget.
+Lists larger than the whole budget are not cached.
+
+Parameters:
+- user_id (int): The user id.
+- rows (list[tuple]): Every transaction of the user, in transaction id order.
+'''
+def put_history(user_id: int, rows: list[tuple]):
+    global history_bytes
+
+    size = sys.getsizeof([]) + sum(row_size(row) for row in rows)
+    with history_mutex:
+        if size > history_budget:
+            return
+        history_bytes += size - history_sizes.get(user_id, 0)
+        history_cache[user_id] = list(rows)
+        history_sizes[user_id] = size
+        evict_history()
+
+'''
+Appends a committed transaction to the cached lists of the users it touches. Must be called in transaction id
+order, which the cache mutex guarantees for the write functions.
+
+Parameters:
+- row (tuple): The transaction as (transaction_id, source_id, target_id, transaction_type, amount, currency_type, created_at).
+'''
+def record_history(row: tuple):
+    global history_bytes
+
+    with history_mutex:
+        for user_id in {row[1], row[2]}:
+            if user_id in history_cache:
+                history_cache[user_id].append(row)
+                history_sizes[user_id] += row_size(row)
+                history_bytes += row_size(row)
+        evict_history()
+
+'''
+Evicts the least recently used users until the cache is within the budget. Must be called while holding history_mutex.
+'''
+def evict_history():
+    global history_bytes
+
+    while history_bytes > history_budget and history_cache:
+        user_id, _ = history_cache.popitem(last=False)
+        history_bytes -= history_sizes.pop(user_id)
+        history_counters[API_Query.EVICTIONS] += 1
+
+'''
+Empties the history cache. The counters are kept.
+'''
+def reset_history():
+    global history_bytes
+
+    with history_mutex:
+        history_cache.clear()
+        history_sizes.clear()
+        history_bytes = 0
+
+'''
+Gets a snapshot of the history cache counters.
+
+Returns:
+- dict: The hit, miss, and eviction counts, the number of cached users, and the bytes used out of the budget.
+'''
+def history_stats() -> dict:
+    with history_mutex:
+        return {**history_counters,
+                API_Query.USERS: len(history_cache),
+                API_Query.BYTES: history_bytes,
+                API_Query.BUDGET: history_budget}
@@ -0,0 +1,96 @@
+from constants import Currency, Error_Message, Opcode
+from server.protocol import decode_response, encode_request, split_frames
+import socket
+
+'''
+Maximum number of operations in flight on a connection.
+'''
+PIPELINE_WINDOW = 1000
+
+'''
+Client for the binary protocol served by server/binary.py. Each method mirrors the matching
+client/database.py function and returns the same (result, error message) tuple.
+
+Many operations can be sent in one round trip with pipeline().
+'''
+class LedgerClient:
+    def __init__(self, host: str = 'localhost', port: int = 3001):
+        self.connection = socket.create_connection((host, port))
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.buffer = bytearray()
+        self.next_request_id = 0
+
+    def __enter__(self) -> "LedgerClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def create_user(self, username: str, email: str) -> tuple[int, str]:
+        return self.pipeline([(Opcode.CREATE, username, email)])[0]
+
+    def deposit(self, user_id: int, amount: float, currency_type: Currency) -> tuple[int, str]:
+        return self.pipeline([(Opcode.DEPOSIT, user_id, amount, currency_type)])[0]
+
+    def transfer(self, source_id: int, target_id: int, amount: float, currency_type: Currency) -> tuple[int, str]:
+        return self.pipeline([(Opcode.TRANSFER, source_id, target_id, amount, currency_type)])[0]
+
+    def balance(self, user_id: int, currency_type: Currency | None = None) -> tuple[dict[Currency, float], str]:
+        return self.pipeline([(Opcode.BALANCE, user_id, currency_type)])[0]
+
+    def withdraw(self, user_id: int, amount: float, currency_type: Currency) -> tuple[int, str]:
+        return self.pipeline([(Opcode.WITHDRAW, user_id, amount, currency_type)])[0]
+
+    '''
+    Sends many operations at once, then reads all of their responses. Operations are sent in windows of
+    PIPELINE_WINDOW, so neither side blocks writing while the other is not reading.
+
+    Parameters:
+    - operations (list[tuple]): The operations, each as an opcode followed by its arguments.
+
+    Returns:
+    - list[tuple]: The (result, error message) tuple of each operation, in order.
+    '''
+    def pipeline(self, operations: list[tuple]) -> list[tuple]:
+        results = []
+        for index in range(0, len(operations), PIPELINE_WINDOW):
+            results.extend(self.send_window(operations[index:index + PIPELINE_WINDOW]))
+        return results
+
+    '''
+    Sends one window of operations and reads their responses. A response to a request id not in the window
+    raises a ValueError, as the connection can no longer be trusted.
+
+    Parameters:
+    - operations (list[tuple]): The operations, each as an opcode followed by its arguments.
+
+    Returns:
+    - list[tuple]: The (result, error message) tuple of each operation, in order.
+    '''
+    def send_window(self, operations: list[tuple]) -> list[tuple]:
+        opcodes = {}
+        requests = []
+        for opcode, *args in operations:
+            self.next_request_id = (self.next_request_id + 1) % (1 << 32)
+            opcodes[self.next_request_id] = opcode
+            requests.append(encode_request(self.next_request_id, opcode, *args))
+        self.connection.sendall(b"".join(requests))
+
+        results = {}
+        while len(results) < len(operations):
+            data = self.connection.recv(1 << 16)
+            if not data:
+                raise ConnectionError("Connection closed by the ledger server.")
+            self.buffer += data
+
+            for payload in split_frames(self.buffer):
+                request_id = int.from_bytes(payload[:4], "big")
+                if request_id not in opcodes:
+                    raise ValueError(Error_Message.INVALID_FRAME)
+                _, result, message = decode_response(payload, opcodes[request_id])
+                results[request_id] = (result, message)
+
+        return [results[request_id] for request_id in opcodes]
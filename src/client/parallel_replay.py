@@ -0,0 +1,51 @@
+from client.replay import apply_deltas, record_deltas
+from client.storage import StorageEngine
+from concurrent.futures import ProcessPoolExecutor
+from constants import Currency
+from itertools import repeat
+import multiprocessing
+
+'''
+Replays one range of transactions. Runs in a worker process when replaying in parallel.
+
+Parameters:
+- storage (StorageEngine): The storage engine holding the transactions.
+- after (int): The transaction id after which transactions are replayed.
+- upto (int): The transaction id up to which transactions are replayed.
+
+Returns:
+- dict[tuple[int, str], list[float]]: The amounts of the range in transaction id order, keyed by user id and currency.
+'''
+def replay_range(storage: StorageEngine, after: int, upto: int) -> dict[tuple[int, str], list[float]]:
+    deltas: dict[tuple[int, str], list[float]] = {}
+    for row in storage.scan_transactions(after, upto):
+        record_deltas(deltas, row)
+    return deltas
+
+'''
+Replays the transactions in a transaction id range onto balances, one chunk of transaction ids at a time. With
+more than one worker, and an engine whose files can be read from other processes, the chunks are read and recorded
+by a pool of worker processes. Either way, the chunks are applied in transaction id order, so every balance is
+rounded exactly as it was by the write functions, whatever the number of workers.
+
+Parameters:
+- storage (StorageEngine): The storage engine holding the transactions.
+- balances (dict[int, dict[Currency, float]]): The balances to replay onto, keyed by user id, updated in place.
+- after (int): The transaction id after which transactions are replayed.
+- upto (int): The transaction id up to which transactions are replayed.
+- workers (int): The number of worker processes. Defaults to 1, replaying in this process.
+- chunk_size (int): The number of transaction ids per chunk. Defaults to 100000.
+'''
+def replay_transactions(storage: StorageEngine, balances: dict[int, dict[Currency, float]], after: int, upto: int,
+                        workers: int = 1, chunk_size: int = 100000):
+    starts = list(range(after, upto, chunk_size))
+    ends = [min(start + chunk_size, upto) for start in starts]
+
+    if workers > 1 and len(starts) > 1 and storage.shared_between_processes:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(min(workers, len(starts)), mp_context=context) as pool:
+            for deltas in pool.map(replay_range, repeat(storage), starts, ends):
+                apply_deltas(balances, deltas)
+    else:
+        for start, end in zip(starts, ends):
+            apply_deltas(balances, replay_range(storage, start, end))
@@ -0,0 +1,172 @@
+from client import database
+from client.database import balance_cache, cache_mutex, cache_ready
+from client.replay import apply_to_ledger
+from client.storage import StorageEngine
+from constants import Currency
+from threading import Event, Thread
+import math
+import time
+
+'''
+Balances recomputed from the storage engine by the reconciler, up to reconciled_through.
+Kept between passes so each pass only replays the transactions committed since the previous one.
+'''
+ledger_balances: dict[int, dict[Currency, float]] = {}
+
+'''
+Transaction id up to which ledger_balances has been replayed.
+'''
+reconciled_through: int = 0
+
+'''
+Storage engine that ledger_balances was replayed from.
+'''
+reconciled_storage: StorageEngine = None
+
+'''
+Drift found by the most recent pass, keyed by user id and currency, as (cached, ledger) balances.
+A cached balance of None means the user appears in the ledger but not in the cache.
+'''
+last_drift: dict[int, dict[Currency, tuple[float | None, float]]] = {}
+
+'''
+Event used to stop the background reconciler thread.
+'''
+reconciler_stop: Event = Event()
+
+'''
+Replays transactions into ledger_balances, in chunks, up to a transaction id. Transactions archived since the
+previous chunk are taken from the opening balances instead.
+
+Parameters:
+- storage (StorageEngine): The storage engine holding the transactions.
+- high_water (int): The transaction id to replay up to.
+- chunk_size (int): The number of transactions read per chunk.
+- duty_cycle (float | None): The fraction of wall time spent working. The reconciler sleeps between chunks
+  to stay under it. If None, chunks are replayed back to back.
+'''
+def catch_up(storage: StorageEngine, high_water: int, chunk_size: int, duty_cycle: float | None):
+    global reconciled_through
+
+    while reconciled_through < high_water and not reconciler_stop.is_set():
+        start = time.monotonic()
+        if reconciled_through < storage.archived_through():
+            watermark, opening_balances = storage.opening_balances()
+            ledger_balances.clear()
+            ledger_balances.update(opening_balances)
+            reconciled_through = watermark
+
+        rows = storage.scan_transactions(reconciled_through, high_water, chunk_size)
+        for row in rows:
+            apply_to_ledger(ledger_balances, row)
+        reconciled_through = rows[-1][0] if len(rows) == chunk_size else max(reconciled_through, high_water)
+
+        if duty_cycle is not None:
+            elapsed = time.monotonic() - start
+            reconciler_stop.wait(elapsed * (1 - duty_cycle) / duty_cycle)
+
+'''
+Runs one reconciliation pass. Replays the transactions committed since the previous pass, then compares
+the recomputed balances with the balance cache, one batch of users at a time. Before each batch, the transactions
+committed in the meantime are replayed without the cache mutex, at the duty cycle, until at most one chunk is left.
+The cache mutex is then only held to replay that chunk and to compare a single batch.
+
+Parameters:
+- chunk_size (int): The number of transactions, and users, handled per chunk. Defaults to 500.
+- duty_cycle (float | None): The fraction of wall time spent working. Defaults to 0.1.
+- repair (bool): Whether to correct drifted balances in the cache to match the ledger. Defaults to False.
+
+Returns:
+- dict[int, dict[Currency, tuple[float | None, float]]]: The drift found, keyed by user id and currency, as (cached, ledger) balances.
+'''
+def reconcile_once(chunk_size: int = 500, duty_cycle: float | None = 0.1,
+                   repair: bool = False) -> dict[int, dict[Currency, tuple[float | None, float]]]:
+    global reconciled_storage, reconciled_through
+
+    storage = database.storage
+    if storage is not reconciled_storage:
+        ledger_balances.clear()
+        reconciled_through = 0
+        reconciled_storage = storage
+
+    drift: dict[int, dict[Currency, tuple[float | None, float]]] = {}
+
+    catch_up(storage, storage.latest_transaction_id(), chunk_size, duty_cycle)
+
+    with cache_mutex:
+        user_ids = list(balance_cache)
+    for user_id in ledger_balances:
+        if user_id not in balance_cache:
+            drift[user_id] = {currency: (None, balance) for currency, balance in ledger_balances[user_id].items()}
+
+    for index in range(0, len(user_ids), chunk_size):
+        compared = False
+        while not compared and not reconciler_stop.is_set():
+            catch_up(storage, storage.latest_transaction_id(), chunk_size, duty_cycle)
+            start = time.monotonic()
+
+            with cache_mutex:
+                high_water = storage.latest_transaction_id()
+                if high_water - reconciled_through > chunk_size:
+                    continue
+                catch_up(storage, high_water, chunk_size, None)
+                if reconciled_through < high_water:
+                    break
+
+                for user_id in user_ids[index:index + chunk_size]:
+                    expected = ledger_balances.get(user_id, {})
+                    for currency, cached in balance_cache[user_id].items():
+                        balance = expected.get(currency, 0)
+                        if not math.isclose(cached, balance, rel_tol=1e-9, abs_tol=1e-9):
+                            drift.setdefault(user_id, {})[currency] = (cached, balance)
+                            if repair:
+                                balance_cache[user_id][currency] = balance
+                compared = True
+
+        if not compared:
+            break
+
+        if duty_cycle is not None:
+            elapsed = time.monotonic() - start
+            reconciler_stop.wait(elapsed * (1 - duty_cycle) / duty_cycle)
+
+    last_drift.clear()
+    last_drift.update(drift)
+
+    if drift:
+        print("Reconciliation drift" + (" repaired:" if repair else ":"), drift)
+
+    return drift
+
+'''
+Starts the background reconciler thread. Passes are skipped until the balance cache is ready.
+
+Parameters:
+- interval (float): The number of seconds between passes. Defaults to 60.
+- chunk_size (int): The number of transactions, and users, handled per chunk. Defaults to 500.
+- duty_cycle (float): The fraction of wall time spent working during a pass. Defaults to 0.1.
+- repair (bool): Whether to correct drifted balances in the cache. Defaults to False.
+
+Returns:
+- Thread: The started daemon thread.
+'''
+def start_reconciler(interval: float = 60, chunk_size: int = 500, duty_cycle: float = 0.1, repair: bool = False) -> Thread:
+    def run():
+        while not reconciler_stop.wait(interval):
+            if not cache_ready.is_set():
+                continue
+            try:
+                reconcile_once(chunk_size, duty_cycle, repair)
+            except Exception as e:
+                print(e)
+
+    reconciler_stop.clear()
+    thread = Thread(target=run, name="reconciler", daemon=True)
+    thread.start()
+    return thread
+
+'''
+Stops the background reconciler thread.
+'''
+def stop_reconciler():
+    reconciler_stop.set()
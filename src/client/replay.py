@@ -0,0 +1,82 @@
+from constants import Currency, Transaction
+
+'''
+Applies a single transaction to the balances of one user.
+
+Parameters:
+- balances (dict[Currency, float]): The running balances of the user, updated in place.
+- user_id (int): The user id whose balances are being replayed.
+- source_id (int): The source user id of the transaction.
+- target_id (int | None): The target user id of the transaction, if any.
+- transaction_type (str): The type of the transaction.
+- amount (float): The amount of the transaction.
+- currency_type (str): The currency of the transaction.
+'''
+def apply_transaction(balances: dict[Currency, float], user_id: int, source_id: int, target_id: int | None,
+                      transaction_type: str, amount: float, currency_type: str):
+    if transaction_type == Transaction.DEPOSIT and source_id == user_id:
+        balances[currency_type] = balances.get(currency_type, 0) + amount
+    elif transaction_type == Transaction.WITHDRAW and source_id == user_id:
+        balances[currency_type] = balances.get(currency_type, 0) - amount
+    elif transaction_type == Transaction.TRANSFER:
+        if source_id == user_id:
+            balances[currency_type] = balances.get(currency_type, 0) - amount
+        if target_id == user_id:
+            balances[currency_type] = balances.get(currency_type, 0) + amount
+
+'''
+Applies a single transaction to the balances of every user it touches.
+
+Parameters:
+- balances (dict[int, dict[Currency, float]]): The balances to update in place.
+- row (tuple): The transaction as (transaction_id, source_id, target_id, transaction_type, amount, currency_type),
+  optionally followed by its creation time.
+'''
+def apply_to_ledger(balances: dict[int, dict[Currency, float]], row: tuple):
+    _, source_id, target_id, transaction_type, amount, currency_type, *_ = row
+
+    source = balances.setdefault(source_id, {currency: 0 for currency in Currency})
+    if transaction_type == Transaction.DEPOSIT:
+        source[currency_type] = source.get(currency_type, 0) + amount
+    elif transaction_type == Transaction.WITHDRAW:
+        source[currency_type] = source.get(currency_type, 0) - amount
+    elif transaction_type == Transaction.TRANSFER:
+        target = balances.setdefault(target_id, {currency: 0 for currency in Currency})
+        source[currency_type] = source.get(currency_type, 0) - amount
+        target[currency_type] = target.get(currency_type, 0) + amount
+
+'''
+Records the amounts of a transaction against every balance it touches, in the order they are recorded.
+
+Parameters:
+- deltas (dict[tuple[int, str], list[float]]): The amounts recorded so far, keyed by user id and currency, updated in place.
+- row (tuple): The transaction as (transaction_id, source_id, target_id, transaction_type, amount, currency_type),
+  optionally followed by its creation time.
+'''
+def record_deltas(deltas: dict[tuple[int, str], list[float]], row: tuple):
+    _, source_id, target_id, transaction_type, amount, currency_type, *_ = row
+
+    if transaction_type == Transaction.DEPOSIT:
+        deltas.setdefault((source_id, currency_type), []).append(amount)
+    elif transaction_type == Transaction.WITHDRAW:
+        deltas.setdefault((source_id, currency_type), []).append(-amount)
+    elif transaction_type == Transaction.TRANSFER:
+        deltas.setdefault((source_id, currency_type), []).append(-amount)
+        deltas.setdefault((target_id, currency_type), []).append(amount)
+
+'''
+Adds recorded amounts to balances one at a time, in the order they were recorded. Applying the deltas of each
+range of transactions in transaction id order rounds every addition exactly as the write functions did, so the
+balances are identical to the ones in the balance cache.
+
+Parameters:
+- balances (dict[int, dict[Currency, float]]): The balances to update in place, keyed by user id.
+- deltas (dict[tuple[int, str], list[float]]): The amounts recorded by record_deltas.
+'''
+def apply_deltas(balances: dict[int, dict[Currency, float]], deltas: dict[tuple[int, str], list[float]]):
+    for (user_id, currency_type), amounts in deltas.items():
+        user_balances = balances.setdefault(user_id, {currency: 0 for currency in Currency})
+        balance = user_balances.get(currency_type, 0)
+        for amount in amounts:
+            balance += amount
+        user_balances[currency_type] = balance
@@ -0,0 +1,405 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from client.archive import archived_through, load_opening_balances, read_archive
+from client.checkpoints import latest_checkpoint_id, latest_transaction_id, load_balance_as_of, load_balances, transaction_id_at, write_checkpoint
+from client.replay import apply_transaction
+from constants import Currency, SQL_Statement
+from threading import Lock
+import sqlite3
+import sys
+
+'''
+Storage engines hold the users and the append-only transaction log the ledger is computed from.
+
+Transactions are passed in as (source_id, target_id, transaction_type, amount, currency_type, created_at)
+and scanned out as (transaction_id, source_id, target_id, transaction_type, amount, currency_type, created_at),
+in transaction id order. Engines implement every abstract method; the others have defaults for engines without
+archiving or checkpoints.
+'''
+class StorageEngine(ABC):
+    '''
+    Whether the engine can be pickled and read from other processes, for parallel replay.
+    '''
+    shared_between_processes: bool = False
+
+    @abstractmethod
+    def create_users_table(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_transactions_table(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def drop_users_table(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def drop_transactions_table(self):
+        raise NotImplementedError
+
+    '''
+    Inserts a new user.
+
+    Returns:
+    - int: The user id.
+    '''
+    @abstractmethod
+    def insert_user(self, username: str, email: str) -> int:
+        raise NotImplementedError
+
+    '''
+    Gets the id of every user, in ascending order.
+    '''
+    @abstractmethod
+    def user_ids(self) -> list[int]:
+        raise NotImplementedError
+
+    '''
+    Appends transactions to the log, atomically.
+
+    Parameters:
+    - rows (list[tuple]): The transactions, without their transaction id.
+
+    Returns:
+    - list[int]: The transaction ids, in the same order.
+    '''
+    @abstractmethod
+    def append_transactions(self, rows: list[tuple]) -> list[int]:
+        raise NotImplementedError
+
+    '''
+    Reads transactions in a transaction id range.
+
+    Parameters:
+    - after (int): The transaction id after which transactions are read.
+    - upto (int | None): The transaction id up to which transactions are read. If None, reads to the end of the log.
+    - limit (int | None): If provided, the maximum number of transactions to read.
+
+    Returns:
+    - list[tuple]: The transactions, in transaction id order.
+    '''
+    @abstractmethod
+    def scan_transactions(self, after: int, upto: int | None = None, limit: int | None = None) -> list[tuple]:
+        raise NotImplementedError
+
+    '''
+    Reads the transactions of one user, as source or target, in a transaction id range.
+
+    Parameters:
+    - user_id (int): The user id.
+    - after (int): The transaction id after which transactions are read.
+    - upto (int | None): The transaction id up to which transactions are read. If None, reads to the end of the log.
+
+    Returns:
+    - list[tuple]: The transactions, in transaction id order.
+    '''
+    @abstractmethod
+    def user_transactions(self, user_id: int, after: int = 0, upto: int | None = None) -> list[tuple]:
+        raise NotImplementedError
+
+    '''
+    Gets the id of the most recent transaction, or 0 if the log is empty.
+    '''
+    @abstractmethod
+    def latest_transaction_id(self) -> int:
+        raise NotImplementedError
+
+    '''
+    Gets the id of the last transaction created at or before a point in time, or 0 if there is none.
+    '''
+    @abstractmethod
+    def transaction_id_at(self, timestamp: float) -> int:
+        raise NotImplementedError
+
+    '''
+    Gets the transaction id up to which transactions have been folded into the opening balances.
+    '''
+    def archived_through(self) -> int:
+        return 0
+
+    '''
+    Gets the opening balances, which transactions are replayed on top of.
+
+    Returns:
+    - tuple[int, dict[int, dict[Currency, float]]]: The transaction id they are valid for, and the balances keyed by user id.
+    '''
+    def opening_balances(self) -> tuple[int, dict[int, dict[Currency, float]]]:
+        return 0, {}
+
+    '''
+    Replays the balances of several users.
+
+    Parameters:
+    - user_ids (list[int]): The user ids for whom the balances are computed.
+    - as_of (int | None): The transaction id up to which transactions are included. If None, includes every transaction.
+
+    Returns:
+    - dict[int, dict[Currency, float]]: The balances, keyed by user id.
+    '''
+    @abstractmethod
+    def load_balances(self, user_ids: list[int], as_of: int | None = None) -> dict[int, dict[Currency, float]]:
+        raise NotImplementedError
+
+    '''
+    Persists the balances of the given users as of a transaction id, to speed up later replays.
+    Engines that replay quickly enough without them may ignore checkpoints.
+    '''
+    def write_checkpoint(self, transaction_id: int, balances: dict[int, dict[Currency, float]]):
+        pass
+
+    '''
+    Gets the users whose balances changed after the most recent checkpoint.
+    '''
+    def users_since_checkpoint(self) -> set[int]:
+        return set()
+
+'''
+Storage engine keeping the users and transactions in two SQLite database files. Balances are replayed from
+checkpoints, and transactions archived by client/archive.py are read back from the archive files.
+'''
+class SQLiteEngine(StorageEngine):
+    shared_between_processes = True
+
+    def __init__(self, users_filename: str, transactions_filename: str):
+        self.users_filename = users_filename
+        self.transactions_filename = transactions_filename
+
+    def create_users_table(self):
+        create_table(self.users_filename, SQL_Statement.USERS_CREATE_TABLE)
+
+    def create_transactions_table(self):
+        filename = self.transactions_filename
+        create_table(filename, SQL_Statement.TRANSACTIONS_JOURNAL_MODE)
+        create_table(filename, SQL_Statement.TRANSACTIONS_CREATE_TABLE)
+        migrate_transactions_table(filename)
+        create_table(filename, SQL_Statement.TRANSACTIONS_SOURCE_INDEX)
+        create_table(filename, SQL_Statement.TRANSACTIONS_TARGET_INDEX)
+        create_table(filename, SQL_Statement.TRANSACTIONS_CREATED_AT_INDEX)
+        create_table(filename, SQL_Statement.CHECKPOINTS_CREATE_TABLE)
+        create_table(filename, SQL_Statement.OPENING_BALANCES_CREATE_TABLE)
+        create_table(filename, SQL_Statement.ARCHIVE_STATE_CREATE_TABLE)
+        create_table(filename, SQL_Statement.ARCHIVE_SEGMENTS_CREATE_TABLE)
+        create_table(filename, SQL_Statement.ARCHIVE_SEGMENTS_INDEX)
+
+    def drop_users_table(self):
+        drop_table(self.users_filename, SQL_Statement.USERS_DROP_TABLE)
+
+    def drop_transactions_table(self):
+        drop_table(self.transactions_filename, SQL_Statement.TRANSACTIONS_DROP_TABLE)
+        drop_table(self.transactions_filename, SQL_Statement.CHECKPOINTS_DROP_TABLE)
+        drop_table(self.transactions_filename, SQL_Statement.OPENING_BALANCES_DROP_TABLE)
+        drop_table(self.transactions_filename, SQL_Statement.ARCHIVE_STATE_DROP_TABLE)
+        drop_table(self.transactions_filename, SQL_Statement.ARCHIVE_SEGMENTS_DROP_TABLE)
+
+    def insert_user(self, username: str, email: str) -> int:
+        with sqlite3.connect(self.users_filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute(SQL_Statement.USERS_INSERT, (username, email))
+            connection.commit()
+            return cursor.lastrowid
+
+    def user_ids(self) -> list[int]:
+        with sqlite3.connect(self.users_filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute(SQL_Statement.USERS_SELECT_IDS)
+            return [row[0] for row in cursor.fetchall()]
+
+    def append_transactions(self, rows: list[tuple]) -> list[int]:
+        ids = []
+        with sqlite3.connect(self.transactions_filename) as connection:
+            cursor = connection.cursor()
+            for row in rows:
+                cursor.execute(SQL_Statement.TRANSACTIONS_INSERT, row)
+                ids.append(cursor.lastrowid)
+            connection.commit()
+        return ids
+
+    '''
+    Reads transactions in a transaction id range, in one read transaction. Archived transactions are read from
+    the archive files, only decompressing the segments overlapping the range.
+    '''
+    def scan_transactions(self, after: int, upto: int | None = None, limit: int | None = None) -> list[tuple]:
+        upto = sys.maxsize if upto is None else upto
+
+        with sqlite3.connect(self.transactions_filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute("BEGIN")
+            rows = []
+            watermark = archived_through(cursor)
+            if after < watermark:
+                rows = read_archive(cursor, self.transactions_filename, after, min(upto, watermark), limit=limit)
+            if upto > watermark and (limit is None or len(rows) < limit):
+                cursor.execute(SQL_Statement.TRANSACTIONS_RANGE,
+                               (max(after, watermark), upto, -1 if limit is None else limit - len(rows)))
+                rows.extend(cursor.fetchall())
+            return rows
+
+    def user_transactions(self, user_id: int, after: int = 0, upto: int | None = None) -> list[tuple]:
+        upto = sys.maxsize if upto is None else upto
+
+        with sqlite3.connect(self.transactions_filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute("BEGIN")
+            rows = []
+            watermark = archived_through(cursor)
+            if after < watermark:
+                rows = read_archive(cursor, self.transactions_filename, after, min(upto, watermark), user_id)
+            if upto > watermark:
+                start = max(after, watermark)
+                cursor.execute(SQL_Statement.TRANSACTIONS_USER_HISTORY,
+                               (user_id, start, upto, user_id, user_id, start, upto))
+                rows.extend(cursor.fetchall())
+            return rows
+
+    def latest_transaction_id(self) -> int:
+        return latest_transaction_id(self.transactions_filename)
+
+    def transaction_id_at(self, timestamp: float) -> int:
+        return transaction_id_at(self.transactions_filename, timestamp)
+
+    def archived_through(self) -> int:
+        with sqlite3.connect(self.transactions_filename) as connection:
+            return archived_through(connection.cursor())
+
+    def opening_balances(self) -> tuple[int, dict[int, dict[Currency, float]]]:
+        with sqlite3.connect(self.transactions_filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute("BEGIN")
+            return archived_through(cursor), load_opening_balances(cursor)
+
+    def load_balances(self, user_ids: list[int], as_of: int | None = None) -> dict[int, dict[Currency, float]]:
+        if as_of is None:
+            return load_balances(self.transactions_filename, user_ids)
+        return {user_id: load_balance_as_of(self.transactions_filename, user_id, as_of) for user_id in user_ids}
+
+    def write_checkpoint(self, transaction_id: int, balances: dict[int, dict[Currency, float]]):
+        write_checkpoint(self.transactions_filename, transaction_id, balances)
+
+    def users_since_checkpoint(self) -> set[int]:
+        with sqlite3.connect(self.transactions_filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute(SQL_Statement.TRANSACTIONS_USERS_AFTER, (latest_checkpoint_id(self.transactions_filename),))
+            return {int(user_id) for row in cursor.fetchall() for user_id in row if user_id is not None}
+
+'''
+Storage engine keeping the users and transactions in memory only, for tests and benchmarks. Nothing is persisted,
+so it measures the cost of the application without the cost of the database.
+'''
+class MemoryEngine(StorageEngine):
+    def __init__(self):
+        self.mutex = Lock()
+        self.users: dict[int, tuple[str, str]] = {}
+        self.emails: set[str] = set()
+        self.transactions: list[tuple] = []
+
+    def create_users_table(self):
+        pass
+
+    def create_transactions_table(self):
+        pass
+
+    def drop_users_table(self):
+        with self.mutex:
+            self.users.clear()
+            self.emails.clear()
+
+    def drop_transactions_table(self):
+        with self.mutex:
+            self.transactions.clear()
+
+    def insert_user(self, username: str, email: str) -> int:
+        with self.mutex:
+            if email in self.emails:
+                raise sqlite3.IntegrityError("UNIQUE constraint failed: users.email")
+            user_id = len(self.users) + 1
+            self.users[user_id] = (username, email)
+            self.emails.add(email)
+            return user_id
+
+    def user_ids(self) -> list[int]:
+        with self.mutex:
+            return list(self.users)
+
+    def append_transactions(self, rows: list[tuple]) -> list[int]:
+        with self.mutex:
+            first_id = len(self.transactions) + 1
+            self.transactions.extend((first_id + index, *row) for index, row in enumerate(rows))
+            return list(range(first_id, first_id + len(rows)))
+
+    def scan_transactions(self, after: int, upto: int | None = None, limit: int | None = None) -> list[tuple]:
+        with self.mutex:
+            upto = len(self.transactions) if upto is None else min(upto, len(self.transactions))
+            if limit is not None:
+                upto = min(upto, after + limit)
+            return self.transactions[max(after, 0):upto]
+
+    def user_transactions(self, user_id: int, after: int = 0, upto: int | None = None) -> list[tuple]:
+        return [row for row in self.scan_transactions(after, upto) if user_id in (row[1], row[2])]
+
+    def latest_transaction_id(self) -> int:
+        return len(self.transactions)
+
+    def transaction_id_at(self, timestamp: float) -> int:
+        with self.mutex:
+            return bisect_right(self.transactions, timestamp, key=lambda row: row[-1])
+
+    def load_balances(self, user_ids: list[int], as_of: int | None = None) -> dict[int, dict[Currency, float]]:
+        balances = {user_id: {currency: 0 for currency in Currency} for user_id in user_ids}
+        for _, source_id, target_id, transaction_type, amount, currency_type, _ in self.scan_transactions(0, as_of):
+            for user_id in (source_id, target_id):
+                if user_id in balances:
+                    apply_transaction(balances[user_id], user_id, source_id, target_id, transaction_type, amount, currency_type)
+                    if target_id == source_id:
+                        break
+        return balances
+
+'''
+Creates a table in the SQLite database using the provided filename and SQL statement.
+
+Parameters:
+- filename (str): The name of the SQLite database file.
+- sql_statement (str): The SQL statement to create the table.
+'''
+def create_table(filename: str, sql_statement: str):
+    try:
+        with sqlite3.connect(filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute(sql_statement)
+            connection.commit()
+    except sqlite3.Error as e:
+        print(e)
+
+'''
+Drops a table from the SQLite database using the provided filename and SQL statement.
+
+Parameters:
+- filename (str): The name of the SQLite database file.
+- sql_statement (str): The SQL statement to drop the table.
+'''
+def drop_table(filename: str, sql_statement: str):
+    try:
+        with sqlite3.connect(filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute(sql_statement)
+    except sqlite3.Error as e:
+        print(e)
+
+'''
+Adds the created_at column to a transactions table created before it existed. Existing rows are
+given a timestamp of 0.
+
+Parameters:
+- filename (str): The name of the SQLite database file.
+'''
+def migrate_transactions_table(filename: str):
+    try:
+        with sqlite3.connect(filename) as connection:
+            cursor = connection.cursor()
+            cursor.execute(SQL_Statement.TRANSACTIONS_COLUMNS)
+            columns = [row[1] for row in cursor.fetchall()]
+            if "created_at" not in columns:
+                cursor.execute(SQL_Statement.TRANSACTIONS_ADD_CREATED_AT)
+                connection.commit()
+    except sqlite3.Error as e:
+        print(e)
@@ -1,11 +1,4 @@
-from enum import StrEnum
-
-"""
-Enum representing different tables.
-"""
-class Table(StrEnum):
-    USERS = "users"
-    TRANSACTIONS = "transactions"
+from enum import IntEnum, StrEnum
 
 """
 Enum representing different filenames for the tables.
@@ -30,23 +23,104 @@ class SQL_Statement(StrEnum):
     target_user_id integer,
     transaction_type text not null,
     amount real not null,
-    currency_type text not null)"""
+    currency_type text not null,
+    created_at real not null default 0)"""
+    TRANSACTIONS_JOURNAL_MODE = """PRAGMA journal_mode=WAL"""
+    TRANSACTIONS_COLUMNS = """PRAGMA table_info(transactions)"""
+    TRANSACTIONS_ADD_CREATED_AT = """ALTER TABLE transactions ADD COLUMN created_at real not null default 0"""
+    TRANSACTIONS_SOURCE_INDEX = """CREATE INDEX IF NOT EXISTS transactions_source_index
+    ON transactions(source_user_id, transaction_id)"""
+    TRANSACTIONS_TARGET_INDEX = """CREATE INDEX IF NOT EXISTS transactions_target_index
+    ON transactions(target_user_id, transaction_id)"""
+    TRANSACTIONS_CREATED_AT_INDEX = """CREATE INDEX IF NOT EXISTS transactions_created_at_index
+    ON transactions(created_at)"""
+    CHECKPOINTS_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS checkpoints (
+    transaction_id integer not null,
+    user_id integer not null,
+    currency_type text not null,
+    balance real not null,
+    primary key (user_id, transaction_id, currency_type))"""
+    OPENING_BALANCES_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS opening_balances (
+    user_id integer not null,
+    currency_type text not null,
+    balance real not null,
+    primary key (user_id, currency_type))"""
+    ARCHIVE_STATE_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS archive_state (
+    state_id integer primary key check (state_id = 0),
+    archived_through integer not null)"""
+    ARCHIVE_SEGMENTS_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS archive_segments (
+    partition_name text not null,
+    byte_offset integer not null,
+    byte_length integer not null,
+    min_transaction_id integer not null,
+    max_transaction_id integer not null,
+    min_created_at real not null,
+    max_created_at real not null,
+    primary key (partition_name, byte_offset))"""
+    ARCHIVE_SEGMENTS_INDEX = """CREATE INDEX IF NOT EXISTS archive_segments_transaction_index
+    ON archive_segments(max_transaction_id)"""
     USERS_DROP_TABLE = """DROP TABLE users"""
     TRANSACTIONS_DROP_TABLE = """DROP TABLE transactions"""
-    USERS_SELECT = """SELECT * FROM users"""
-    TRANSACTIONS_SELECT = """SELECT * FROM transactions"""
+    CHECKPOINTS_DROP_TABLE = """DROP TABLE checkpoints"""
+    OPENING_BALANCES_DROP_TABLE = """DROP TABLE opening_balances"""
+    ARCHIVE_STATE_DROP_TABLE = """DROP TABLE archive_state"""
+    ARCHIVE_SEGMENTS_DROP_TABLE = """DROP TABLE archive_segments"""
+    USERS_SELECT_IDS = """SELECT user_id FROM users ORDER BY user_id"""
     USERS_INSERT = """INSERT INTO users(user_name, email)
     VALUES(?,?)"""
-    TRANSACTIONS_DEPOSIT = """INSERT INTO transactions(source_user_id, transaction_type, amount, currency_type)
-    VALUES(?, "deposit", ?, ?)"""
-    TRANSACTIONS_TRANSFER =  """INSERT INTO transactions(source_user_id, target_user_id, transaction_type, amount, currency_type)
-    VALUES(?, ?, "transfer", ?, ?)"""
-    TRANSACTIONS_BALANCE = """SELECT * FROM transactions
-    WHERE (source_user_id = ? AND transaction_type = 'deposit')
-    OR (target_user_id = ? AND transaction_type = 'transfer')
-    OR (source_user_id = ? AND transaction_type = 'transfer')"""
-    TRANSACTIONS_WITHDRAW = """INSERT INTO transactions(source_user_id, transaction_type, amount, currency_type)
-    VALUES(?, "withdraw", ?, ?)"""
+    TRANSACTIONS_INSERT = """INSERT INTO transactions(source_user_id, target_user_id, transaction_type, amount, currency_type, created_at)
+    VALUES(?, ?, ?, ?, ?, ?)"""
+    TRANSACTIONS_USER_RANGE = """SELECT transaction_id, source_user_id, target_user_id, transaction_type, amount, currency_type
+    FROM transactions
+    WHERE source_user_id = ? AND transaction_id > ? AND transaction_id <= ?
+    UNION ALL
+    SELECT transaction_id, source_user_id, target_user_id, transaction_type, amount, currency_type
+    FROM transactions
+    WHERE target_user_id = ? AND source_user_id != ? AND transaction_id > ? AND transaction_id <= ?
+    ORDER BY transaction_id"""
+    TRANSACTIONS_USER_HISTORY = """SELECT transaction_id, source_user_id, target_user_id, transaction_type, amount, currency_type, created_at
+    FROM transactions
+    WHERE source_user_id = ? AND transaction_id > ? AND transaction_id <= ?
+    UNION ALL
+    SELECT transaction_id, source_user_id, target_user_id, transaction_type, amount, currency_type, created_at
+    FROM transactions
+    WHERE target_user_id = ? AND source_user_id != ? AND transaction_id > ? AND transaction_id <= ?
+    ORDER BY transaction_id"""
+    TRANSACTIONS_RANGE = """SELECT transaction_id, source_user_id, target_user_id, transaction_type, amount, currency_type, created_at
+    FROM transactions
+    WHERE transaction_id > ? AND transaction_id <= ?
+    ORDER BY transaction_id
+    LIMIT ?"""
+    TRANSACTIONS_AFTER = """SELECT transaction_id, source_user_id, target_user_id, transaction_type, amount, currency_type, created_at
+    FROM transactions
+    WHERE transaction_id > ?
+    ORDER BY transaction_id
+    LIMIT ?"""
+    TRANSACTIONS_DELETE_RANGE = """DELETE FROM transactions WHERE transaction_id > ? AND transaction_id <= ?"""
+    TRANSACTIONS_MAX_ID = """SELECT max(transaction_id) FROM transactions"""
+    TRANSACTIONS_ID_AT_TIME = """SELECT max(transaction_id) FROM transactions WHERE created_at <= ?"""
+    TRANSACTIONS_USERS_AFTER = """SELECT source_user_id, target_user_id FROM transactions WHERE transaction_id > ?"""
+    CHECKPOINTS_INSERT = """INSERT OR REPLACE INTO checkpoints(transaction_id, user_id, currency_type, balance)
+    VALUES(?, ?, ?, ?)"""
+    CHECKPOINTS_LATEST = """SELECT max(transaction_id) FROM checkpoints WHERE user_id = ? AND transaction_id <= ?"""
+    CHECKPOINTS_SELECT = """SELECT currency_type, balance FROM checkpoints WHERE user_id = ? AND transaction_id = ?"""
+    CHECKPOINTS_MAX_ID = """SELECT max(transaction_id) FROM checkpoints"""
+    OPENING_BALANCES_SELECT = """SELECT user_id, currency_type, balance FROM opening_balances"""
+    OPENING_BALANCES_SELECT_USER = """SELECT currency_type, balance FROM opening_balances WHERE user_id = ?"""
+    OPENING_BALANCES_UPSERT = """INSERT OR REPLACE INTO opening_balances(user_id, currency_type, balance)
+    VALUES(?, ?, ?)"""
+    ARCHIVE_STATE_SELECT = """SELECT archived_through FROM archive_state WHERE state_id = 0"""
+    ARCHIVE_STATE_UPSERT = """INSERT OR REPLACE INTO archive_state(state_id, archived_through)
+    VALUES(0, ?)"""
+    ARCHIVE_SEGMENTS_INSERT = """INSERT OR REPLACE INTO archive_segments(partition_name, byte_offset, byte_length,
+    min_transaction_id, max_transaction_id, min_created_at, max_created_at)
+    VALUES(?, ?, ?, ?, ?, ?, ?)"""
+    ARCHIVE_SEGMENTS_RANGE = """SELECT partition_name, byte_offset, byte_length FROM archive_segments
+    WHERE max_transaction_id > ? AND min_transaction_id <= ?
+    ORDER BY min_transaction_id"""
+    ARCHIVE_SEGMENTS_AT_TIME = """SELECT partition_name, byte_offset, byte_length, max_transaction_id, max_created_at
+    FROM archive_segments
+    WHERE min_created_at <= ?"""
 
 
 """
@@ -73,6 +147,15 @@ class Error_Message(StrEnum):
     INSUFFICIENT_FUNDS_WITHDRAW = "Insufficient funds for withdrawl."
     INVALID_SOURCE_USER = "Source user id not found."
     INVALID_TARGET_USER = "Target user id not found."
+    INVALID_AS_OF = "As of transaction id not found."
+    INVALID_LIMIT = "Limit must be a positive integer."
+    INVALID_AMOUNT = "Amount must be a finite number."
+    INVALID_CURRENCY = "Currency type must be bitcoin, ethereum, or matic."
+    CACHE_WARMING = "Ledger is warming up. Try again shortly."
+    RATE_LIMITED = "Too many requests. Try again shortly."
+    OVERLOADED = "Server is overloaded. Try again shortly."
+    INVALID_OPCODE = "Unknown operation."
+    INVALID_FRAME = "Malformed request."
 
 """
 Enum representing the parameter names in the API.
@@ -86,4 +169,40 @@ class API_Query(StrEnum):
     SOURCE_USER_ID = "source_user_id"
     TARGET_USER_ID = "target_user_id"
     TRANSACTION_ID = "transaction_id"
+    AS_OF = "as_of"
+    AS_OF_TIME = "as_of_time"
+    TRANSACTION_TYPE = "transaction_type"
+    CREATED_AT = "created_at"
+    AFTER = "after"
+    LIMIT = "limit"
+    TIMEOUT = "timeout"
+    EVENTS = "events"
+    CURSOR = "cursor"
+    STATUS = "status"
+    READY = "ready"
+    LOADED_USERS = "loaded_users"
+    TOTAL_USERS = "total_users"
+    TRANSACTIONS = "transactions"
+    IN_FLIGHT = "in_flight"
+    QUEUED = "queued"
+    ENDPOINTS = "endpoints"
+    ADMITTED = "admitted"
+    RATE_LIMITED = "rate_limited"
+    SHED = "shed"
+    HITS = "hits"
+    MISSES = "misses"
+    EVICTIONS = "evictions"
+    USERS = "users"
+    BYTES = "bytes"
+    BUDGET = "budget"
     ERROR = "error"
+
+"""
+Enum representing the operations of the binary protocol.
+"""
+class Opcode(IntEnum):
+    CREATE = 1
+    DEPOSIT = 2
+    TRANSFER = 3
+    BALANCE = 4
+    WITHDRAW = 5
\ No newline at end of file
@@ -0,0 +1,64 @@
+from client import database
+from client.events import read_events
+from constants import API_Query, Error_Message
+from controllers.ledgers import error_response
+from flask import Response, request, stream_with_context
+from server.app import app
+import json
+
+'''
+Maximum number of events returned per response, so a lagging consumer catches up in bounded batches.
+'''
+MAX_EVENTS = 1000
+
+'''
+Maximum number of seconds a long-poll request waits for a new event.
+'''
+MAX_TIMEOUT = 30.0
+
+'''
+Events Endpoint, to long-poll the committed deposits, transfers, and withdrawals after a cursor.
+A limit below 1 returns 400, and a negative timeout does not wait.
+
+Returns:
+    dict: Response containing the events and the cursor to resume from.
+'''
+@app.route('/events')
+def getEvents():
+    after = request.args.get(API_Query.AFTER, 0, int)
+    limit = min(request.args.get(API_Query.LIMIT, MAX_EVENTS, int), MAX_EVENTS)
+    timeout = min(max(request.args.get(API_Query.TIMEOUT, 0, float), 0), MAX_TIMEOUT)
+
+    if limit < 1:
+        return error_response(Error_Message.INVALID_LIMIT)
+
+    events = read_events(database.storage, after, limit, timeout)
+    cursor = events[-1][API_Query.TRANSACTION_ID] if events else after
+
+    return {API_Query.EVENTS: events, API_Query.CURSOR: cursor}
+
+'''
+Event Stream Endpoint, to stream the committed deposits, transfers, and withdrawals after a cursor as
+Server-Sent Events. Resumes from the Last-Event-ID header when reconnecting.
+
+Returns:
+    Response: An event stream, with the transaction id as the id of each event.
+'''
+@app.route('/events/stream')
+def streamEvents():
+    after = request.headers.get("Last-Event-ID", None, int)
+    if after is None:
+        after = request.args.get(API_Query.AFTER, 0, int)
+    storage = database.storage
+
+    def generate():
+        cursor = after
+        while True:
+            events = read_events(storage, cursor, MAX_EVENTS, MAX_TIMEOUT)
+            if not events:
+                yield ": keep-alive\n\n"
+            for event in events:
+                cursor = event[API_Query.TRANSACTION_ID]
+                yield f"id: {cursor}\ndata: {json.dumps(event)}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
@@ -0,0 +1,28 @@
+from client.database import cache_ready, warmup_progress
+from constants import API_Query
+from server.app import app
+
+'''
+Liveness Endpoint, to show the server is up and accepting requests.
+
+Returns:
+    dict: Response containing the status.
+'''
+@app.route('/health/live')
+def liveness():
+    return {API_Query.STATUS: "alive"}
+
+'''
+Readiness Endpoint, to show whether every user's balances have been loaded into the cache.
+
+Returns:
+    tuple[dict, int]: Response containing ready, loaded_users, and total_users, plus the error of the last attempt
+    while a failed warm-up is being retried. 200 once ready, 503 while warming up.
+'''
+@app.route('/health/ready')
+def readiness():
+    ready = cache_ready.is_set()
+    response = {API_Query.READY: ready}
+    response.update(warmup_progress)
+
+    return response, 200 if ready else 503
@@ -1,8 +1,31 @@
-from constants import API_Query, Currency
-from client.database import insert_user, deposit_transaction, transfer_transaction, balance_transaction, withdraw_transaction
+from constants import API_Query, Currency, Error_Message
+from client.database import insert_user, deposit_transaction, transfer_transaction, balance_transaction, balance_as_of_transaction, history_transaction, withdraw_transaction
+from client.events import make_event
 from flask import request
+from server.admission import admit
 from server.app import app
 
+'''
+Status codes of the errors not returned as 200. Warming up errors are returned as 503 Service Unavailable, so clients
+know to retry, and invalid parameters as 400 Bad Request.
+'''
+error_status: dict[Error_Message, int] = {Error_Message.CACHE_WARMING: 503,
+                                          Error_Message.INVALID_AS_OF: 400,
+                                          Error_Message.INVALID_LIMIT: 400,
+                                          Error_Message.INVALID_AMOUNT: 400}
+
+'''
+Builds an error response.
+
+Parameters:
+- message (str): The error message.
+
+Returns:
+    tuple[dict, int]: Response containing the error, and the status code.
+'''
+def error_response(message: str) -> tuple[dict, int]:
+    return {API_Query.ERROR: message}, error_status.get(message, 200)
+
 '''
 Landing Page.
 
@@ -20,13 +43,14 @@ Returns:
     dict: Response containing user_id, name, and email.
 '''
 @app.route('/create')
+@admit('create')
 def createUser():
     name = request.args.get(API_Query.NAME, None, str)
     email = request.args.get(API_Query.EMAIL, None, str)
 
     user_id, message = insert_user(name, email)
     if user_id is None:
-        return {API_Query.ERROR: message}
+        return error_response(message)
     
     print("Create:", (user_id, name, email))
 
@@ -39,6 +63,7 @@ Returns:
     dict: Response containing transaction_id, user_id, amount, and currency_type.
 '''
 @app.route('/deposit')
+@admit('deposit')
 def deposit():
     user_id = request.args.get(API_Query.USER_ID, None, int)
     amount = request.args.get(API_Query.AMOUNT, None, float)
@@ -46,7 +71,7 @@ def deposit():
 
     transaction_id, message = deposit_transaction(user_id, amount, currency_type)
     if transaction_id is None:
-        return {API_Query.ERROR: message}
+        return error_response(message)
     
     print("Deposit:", (transaction_id, user_id, amount, currency_type))
     
@@ -59,6 +84,7 @@ Returns:
     dict: Response containing transaction_id, source_user_id, target_user_id, amount, and currency_type.
 '''
 @app.route('/transfer')
+@admit('transfer')
 def transfer():
     source_id = request.args.get(API_Query.SOURCE_USER_ID, None, int)
     target_id = request.args.get(API_Query.TARGET_USER_ID, None, int)
@@ -67,7 +93,7 @@ def transfer():
 
     transaction_id, message = transfer_transaction(source_id, target_id, amount, currency_type)
     if transaction_id is None:
-        return {API_Query.ERROR: message}
+        return error_response(message)
     
     print("Transfer:", (transaction_id, source_id, target_id, amount, currency_type))
 
@@ -75,6 +101,7 @@ def transfer():
 
 '''
 Balance Endpoint, to show the current balance of a given currency for a user's account.
+If as_of or as_of_time is provided, shows the balance as of that transaction id or point in time.
 
 Returns:
     dict: Response containing user_id and balance based on currency. If no currency provided, show all currency balances.
@@ -83,16 +110,41 @@ Returns:
 def getBalances():
     user_id = request.args.get(API_Query.USER_ID, None, int)
     currency_type = request.args.get(API_Query.CURRENCY_TYPE, None, Currency)
+    as_of = request.args.get(API_Query.AS_OF, None, int)
+    as_of_time = request.args.get(API_Query.AS_OF_TIME, None, float)
 
-    map, msessage = balance_transaction(user_id, currency_type)
+    if as_of is None and as_of_time is None:
+        map, msessage = balance_transaction(user_id, currency_type)
+    else:
+        map, as_of, msessage = balance_as_of_transaction(user_id, currency_type, as_of, as_of_time)
     if map is None:
-        return {API_Query.ERROR: msessage}
+        return error_response(msessage)
     
     response = {API_Query.USER_ID: user_id}
+    if as_of is not None:
+        response[API_Query.AS_OF] = as_of
     response.update(map)
 
     return response
 
+'''
+History Endpoint, to show the deposits, transfers, and withdrawals of a user's account, oldest first.
+If limit is provided, shows only the most recent transactions. A limit below 1 returns 400.
+
+Returns:
+    dict: Response containing user_id and transactions.
+'''
+@app.route('/history')
+def getHistory():
+    user_id = request.args.get(API_Query.USER_ID, None, int)
+    limit = request.args.get(API_Query.LIMIT, None, int)
+
+    rows, message = history_transaction(user_id, limit)
+    if rows is None:
+        return error_response(message)
+
+    return {API_Query.USER_ID: user_id, API_Query.TRANSACTIONS: [make_event(*row) for row in rows]}
+
 '''
 Withdraw Endpoint, to withdraw money from a user's account.
 
@@ -100,6 +152,7 @@ Returns:
     dict: Response containing transaction_id, user_id, amount, and currency_type.
 '''
 @app.route('/withdraw')
+@admit('withdraw')
 def withdraw():
     user_id = request.args.get(API_Query.USER_ID, None, int)
     amount = request.args.get(API_Query.AMOUNT, None, float)
@@ -107,7 +160,7 @@ def withdraw():
 
     transaction_id, message = withdraw_transaction(user_id, amount, currency_type)
     if transaction_id is None:
-        return {API_Query.ERROR: message}
+        return error_response(message)
     
     print("Withdraw:", (transaction_id, user_id, amount, currency_type))
     
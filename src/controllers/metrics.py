@@ -0,0 +1,23 @@
+from client.history import history_stats
+from server.admission import admission_stats
+from server.app import app
+
+'''
+Admission Metrics Endpoint, to show the admission control counters.
+
+Returns:
+    dict: Response containing the in-flight and queued request counts, and the admitted, queued, rate limited, and shed counts per endpoint.
+'''
+@app.route('/metrics/admission')
+def admissionMetrics():
+    return admission_stats()
+
+'''
+History Metrics Endpoint, to show the history cache counters.
+
+Returns:
+    dict: Response containing the hit, miss, and eviction counts, the number of cached users, and the bytes used out of the budget.
+'''
+@app.route('/metrics/history')
+def historyMetrics():
+    return history_stats()
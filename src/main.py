@@ -1,12 +1,22 @@
-from client.database import create_transactions_table, create_users_table, populate_balance_cache
+from client import database
+from client.archive import start_archiver
+from client.database import create_transactions_table, create_users_table, hot_accounts, start_cache_warmup, storage
+from client.reconciler import start_reconciler
 from server.app import app
+from server.binary import start_binary_server
+import os
 import sys
 
 
 def main():
     create_users_table()
     create_transactions_table()
-    populate_balance_cache()
+    hot_accounts.update(int(user_id) for user_id in os.environ.get("LEDGER_HOT_ACCOUNTS", "").split(",") if user_id)
+    database.replay_workers = int(os.environ.get("LEDGER_REPLAY_WORKERS", "1"))
+    start_cache_warmup()
+    start_reconciler()
+    start_archiver(storage.transactions_filename)
+    start_binary_server(host='localhost', port=3001)
 
     app.run(host='localhost', port=3000)
     return 0
@@ -0,0 +1,201 @@
+from collections import OrderedDict
+from constants import API_Query, Error_Message
+from flask import request
+from functools import wraps
+from threading import Condition, Lock
+import time
+
+'''
+Per-client token bucket limits for each endpoint, as (requests per second, burst size).
+'''
+rate_limits: dict[str, tuple[float, float]] = {"create": (50, 100),
+                                               "deposit": (100, 200),
+                                               "transfer": (100, 200),
+                                               "withdraw": (100, 200)}
+
+'''
+Maximum number of admitted requests running at once, across all endpoints.
+'''
+max_in_flight: int = 32
+
+'''
+Maximum number of requests waiting for an in-flight slot. Requests beyond it are shed immediately.
+'''
+max_queued: int = 64
+
+'''
+Maximum number of seconds a request waits for an in-flight slot before it is shed.
+'''
+queue_timeout: float = 0.5
+
+'''
+Maximum number of token buckets kept. Beyond it, the least recently used bucket is evicted.
+'''
+max_buckets: int = 10000
+
+'''
+Token buckets keyed by (endpoint, client), as [tokens, last refill time], least recently used first. Guarded by bucket_mutex.
+'''
+buckets: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+
+'''
+Mutex lock when accessing the token buckets
+'''
+bucket_mutex: Lock = Lock()
+
+'''
+Condition guarding the in-flight and queued request counts.
+'''
+slot_condition: Condition = Condition()
+
+'''
+Admission counters, keyed by endpoint then counter name. Guarded by slot_condition.
+'''
+admission_counters: dict[str, dict[API_Query, int]] = {}
+
+'''
+Current number of admitted and waiting requests. Guarded by slot_condition.
+'''
+in_flight: int = 0
+queued: int = 0
+
+'''
+Increments an admission counter. Must be called while holding slot_condition.
+
+Parameters:
+- endpoint (str): The endpoint name.
+- counter (API_Query): The counter name.
+'''
+def count(endpoint: str, counter: API_Query):
+    counters = admission_counters.setdefault(endpoint, {API_Query.ADMITTED: 0, API_Query.QUEUED: 0,
+                                                        API_Query.RATE_LIMITED: 0, API_Query.SHED: 0})
+    counters[counter] += 1
+
+'''
+Takes a token from the client's bucket for an endpoint. Creating a bucket when max_buckets are kept evicts the
+least recently used one, whose client would most likely have refilled it by now anyway.
+
+Parameters:
+- endpoint (str): The endpoint name.
+- client (str): The client address.
+
+Returns:
+- bool: Whether a token was available.
+'''
+def take_token(endpoint: str, client: str) -> bool:
+    if endpoint not in rate_limits:
+        return True
+    rate, burst = rate_limits[endpoint]
+    now = time.monotonic()
+
+    with bucket_mutex:
+        key = (endpoint, client)
+        if key in buckets:
+            buckets.move_to_end(key)
+        else:
+            while buckets and len(buckets) >= max_buckets:
+                buckets.popitem(last=False)
+            buckets[key] = [burst, now]
+
+        bucket = buckets[key]
+        bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+'''
+Acquires an in-flight slot, waiting in the bounded queue if all slots are taken.
+
+Parameters:
+- endpoint (str): The endpoint name.
+
+Returns:
+- bool: Whether a slot was acquired. False if the queue was full or the wait timed out.
+'''
+def acquire_slot(endpoint: str) -> bool:
+    global in_flight, queued
+
+    with slot_condition:
+        if in_flight < max_in_flight:
+            in_flight += 1
+            return True
+        if queued >= max_queued:
+            return False
+
+        queued += 1
+        count(endpoint, API_Query.QUEUED)
+        try:
+            if not slot_condition.wait_for(lambda: in_flight < max_in_flight, queue_timeout):
+                return False
+            in_flight += 1
+            return True
+        finally:
+            queued -= 1
+
+'''
+Releases an in-flight slot and wakes one waiting request.
+'''
+def release_slot():
+    global in_flight
+
+    with slot_condition:
+        in_flight -= 1
+        slot_condition.notify()
+
+'''
+Decorator applying admission control to an endpoint. Requests over the client's rate limit are rejected
+with 429 Too Many Requests. Requests that find every in-flight slot taken wait in a bounded queue, and are
+rejected with 503 Service Unavailable when the queue is full or the wait times out.
+
+Parameters:
+- endpoint (str): The endpoint name, used to look up its rate limit and to report its counters.
+
+Returns:
+    Callable: The decorator.
+'''
+def admit(endpoint: str):
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not take_token(endpoint, request.remote_addr):
+                with slot_condition:
+                    count(endpoint, API_Query.RATE_LIMITED)
+                return {API_Query.ERROR: Error_Message.RATE_LIMITED}, 429, {"Retry-After": "1"}
+
+            if not acquire_slot(endpoint):
+                with slot_condition:
+                    count(endpoint, API_Query.SHED)
+                return {API_Query.ERROR: Error_Message.OVERLOADED}, 503, {"Retry-After": "1"}
+
+            try:
+                with slot_condition:
+                    count(endpoint, API_Query.ADMITTED)
+                return function(*args, **kwargs)
+            finally:
+                release_slot()
+        return wrapper
+    return decorator
+
+'''
+Gets a snapshot of the admission counters.
+
+Returns:
+- dict: The current in-flight and queued request counts, and the counters of each endpoint.
+'''
+def admission_stats() -> dict:
+    with slot_condition:
+        return {API_Query.IN_FLIGHT: in_flight,
+                API_Query.QUEUED: queued,
+                API_Query.ENDPOINTS: {endpoint: dict(counters) for endpoint, counters in admission_counters.items()}}
+
+'''
+Clears the token buckets and the admission counters.
+'''
+def reset_admission():
+    with bucket_mutex:
+        buckets.clear()
+    with slot_condition:
+        admission_counters.clear()
@@ -2,4 +2,7 @@ from flask import Flask
 
 app = Flask(__name__)
 
-import controllers.ledgers
\ No newline at end of file
+import controllers.ledgers
+import controllers.events
+import controllers.health
+import controllers.metrics
\ No newline at end of file
@@ -0,0 +1,81 @@
+from client.database import insert_user, deposit_transaction, transfer_transaction, balance_transaction, withdraw_transaction
+from constants import Error_Message, Opcode
+from server.protocol import HEADER, decode_request, encode_response, split_frames
+from threading import Thread
+import socketserver
+
+'''
+Database functions serving each operation of the binary protocol.
+'''
+operations = {Opcode.CREATE: insert_user,
+              Opcode.DEPOSIT: deposit_transaction,
+              Opcode.TRANSFER: transfer_transaction,
+              Opcode.BALANCE: balance_transaction,
+              Opcode.WITHDRAW: withdraw_transaction}
+
+'''
+Handles one request payload. A request whose header decodes but whose body does not is answered with an
+invalid frame error under its own request id, so the client can match the error to the request.
+
+Parameters:
+- payload (bytes): The payload of a request frame.
+
+Returns:
+- bytes: The framed response.
+'''
+def handle_payload(payload: bytes) -> bytes:
+    try:
+        request_id, opcode, args = decode_request(payload)
+    except Exception:
+        request_id = HEADER.unpack_from(payload)[0] if len(payload) >= HEADER.size else 0
+        return encode_response(request_id, None, None, Error_Message.INVALID_FRAME)
+
+    if opcode is None:
+        return encode_response(request_id, opcode, None, Error_Message.INVALID_OPCODE)
+
+    result, message = operations[opcode](*args)
+    return encode_response(request_id, opcode, result, message)
+
+'''
+Connection handler for the binary protocol. Reads whatever has arrived, answers every complete frame in it,
+and sends the responses back in a single write, so pipelined requests cost one round trip per batch.
+'''
+class BinaryHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        buffer = bytearray()
+
+        while True:
+            data = self.request.recv(1 << 16)
+            if not data:
+                return
+            buffer += data
+
+            try:
+                payloads = split_frames(buffer)
+            except ValueError:
+                return
+
+            if payloads:
+                self.request.sendall(b"".join(handle_payload(payload) for payload in payloads))
+
+'''
+Threaded TCP server for the binary protocol, one thread per connection.
+'''
+class BinaryServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+'''
+Starts the binary protocol server in a background thread.
+
+Parameters:
+- host (str): The host to listen on. Defaults to localhost.
+- port (int): The port to listen on. Defaults to 3001. Use 0 for any free port.
+
+Returns:
+- BinaryServer: The running server. Its server_address holds the bound port.
+'''
+def start_binary_server(host: str = 'localhost', port: int = 3001) -> BinaryServer:
+    server = BinaryServer((host, port), BinaryHandler)
+    Thread(target=server.serve_forever, name="binary-server", daemon=True).start()
+    return server
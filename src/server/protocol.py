@@ -0,0 +1,225 @@
+from constants import Currency, Error_Message, Opcode
+import struct
+
+'''
+Compact binary protocol for the ledger operations.
+
+Every message is a frame: a 4-byte big-endian payload length, then the payload. Requests start with a
+request id and an opcode, responses with the same request id and a status. Requests may be pipelined;
+responses are sent in request order.
+
+Request bodies:
+- CREATE: name and email, each as a 2-byte length then UTF-8 bytes.
+- DEPOSIT, WITHDRAW: user id (8 bytes), amount (8-byte float), currency index (1 byte).
+- TRANSFER: source user id, target user id, amount, currency index.
+- BALANCE: user id, currency index, or ALL_CURRENCIES for every currency.
+
+Response bodies, when the status is OK:
+- CREATE: user id. DEPOSIT, TRANSFER, WITHDRAW: transaction id.
+- BALANCE: number of balances (1 byte), then each as currency index and amount.
+When the status is ERROR, the body is the error message as a 2-byte length then UTF-8 bytes.
+'''
+
+FRAME = struct.Struct("!I")
+HEADER = struct.Struct("!IB")
+ID = struct.Struct("!q")
+STRING_LENGTH = struct.Struct("!H")
+AMOUNT_OPERATION = struct.Struct("!qdB")
+TRANSFER_OPERATION = struct.Struct("!qqdB")
+BALANCE_OPERATION = struct.Struct("!qB")
+BALANCE_ENTRY = struct.Struct("!Bd")
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+ALL_CURRENCIES = 255
+
+'''
+Currencies in wire order. The currency index is the position in this list.
+'''
+CURRENCIES: list[Currency] = list(Currency)
+
+'''
+Maximum payload length accepted, to bound the memory used by a malformed or hostile frame.
+'''
+MAX_FRAME_LENGTH = 1 << 16
+
+'''
+Wraps a payload in a frame.
+
+Parameters:
+- payload (bytes): The payload.
+
+Returns:
+- bytes: The frame.
+'''
+def frame(payload: bytes) -> bytes:
+    return FRAME.pack(len(payload)) + payload
+
+'''
+Splits the complete frames off the front of a buffer.
+
+Parameters:
+- buffer (bytearray): The received bytes. Complete frames are removed from it.
+
+Returns:
+- list[bytes]: The payloads of the complete frames.
+'''
+def split_frames(buffer: bytearray) -> list[bytes]:
+    payloads = []
+    offset = 0
+
+    while len(buffer) - offset >= FRAME.size:
+        (length,) = FRAME.unpack_from(buffer, offset)
+        if length > MAX_FRAME_LENGTH:
+            raise ValueError(Error_Message.INVALID_FRAME)
+        if len(buffer) - offset - FRAME.size < length:
+            break
+        payloads.append(bytes(buffer[offset + FRAME.size:offset + FRAME.size + length]))
+        offset += FRAME.size + length
+
+    del buffer[:offset]
+    return payloads
+
+'''
+Encodes a string as a 2-byte length then UTF-8 bytes.
+'''
+def pack_string(value: str) -> bytes:
+    data = value.encode()
+    return STRING_LENGTH.pack(len(data)) + data
+
+'''
+Decodes a string written by pack_string.
+
+Returns:
+- tuple[str, int]: The string, and the offset just past it.
+'''
+def unpack_string(payload: bytes, offset: int) -> tuple[str, int]:
+    (length,) = STRING_LENGTH.unpack_from(payload, offset)
+    offset += STRING_LENGTH.size
+    return payload[offset:offset + length].decode(), offset + length
+
+'''
+Converts a currency to its wire index. None means every currency.
+'''
+def currency_index(currency_type: Currency | None) -> int:
+    return ALL_CURRENCIES if currency_type is None else CURRENCIES.index(currency_type)
+
+'''
+Converts a wire index back to a currency. ALL_CURRENCIES converts to None.
+'''
+def index_currency(index: int) -> Currency | None:
+    return None if index == ALL_CURRENCIES else CURRENCIES[index]
+
+'''
+Encodes a request.
+
+Parameters:
+- request_id (int): The request id, echoed in the response.
+- opcode (Opcode): The operation.
+- args (tuple): The operation's arguments, in the same order as the matching client/database.py function.
+
+Returns:
+- bytes: The framed request.
+'''
+def encode_request(request_id: int, opcode: Opcode, *args) -> bytes:
+    header = HEADER.pack(request_id, opcode)
+
+    if opcode == Opcode.CREATE:
+        name, email = args
+        body = pack_string(name) + pack_string(email)
+    elif opcode in (Opcode.DEPOSIT, Opcode.WITHDRAW):
+        user_id, amount, currency_type = args
+        body = AMOUNT_OPERATION.pack(user_id, amount, currency_index(currency_type))
+    elif opcode == Opcode.TRANSFER:
+        source_id, target_id, amount, currency_type = args
+        body = TRANSFER_OPERATION.pack(source_id, target_id, amount, currency_index(currency_type))
+    elif opcode == Opcode.BALANCE:
+        user_id, currency_type = args
+        body = BALANCE_OPERATION.pack(user_id, currency_index(currency_type))
+    else:
+        raise ValueError(Error_Message.INVALID_OPCODE)
+
+    return frame(header + body)
+
+'''
+Decodes a request payload.
+
+Parameters:
+- payload (bytes): The payload of a request frame.
+
+Returns:
+- tuple[int, Opcode, tuple]: The request id, the operation, and its arguments.
+'''
+def decode_request(payload: bytes) -> tuple[int, Opcode, tuple]:
+    request_id, opcode = HEADER.unpack_from(payload)
+    offset = HEADER.size
+
+    if opcode == Opcode.CREATE:
+        name, offset = unpack_string(payload, offset)
+        email, offset = unpack_string(payload, offset)
+        args = (name, email)
+    elif opcode in (Opcode.DEPOSIT, Opcode.WITHDRAW):
+        user_id, amount, index = AMOUNT_OPERATION.unpack_from(payload, offset)
+        args = (user_id, amount, index_currency(index))
+    elif opcode == Opcode.TRANSFER:
+        source_id, target_id, amount, index = TRANSFER_OPERATION.unpack_from(payload, offset)
+        args = (source_id, target_id, amount, index_currency(index))
+    elif opcode == Opcode.BALANCE:
+        user_id, index = BALANCE_OPERATION.unpack_from(payload, offset)
+        args = (user_id, index_currency(index))
+    else:
+        return request_id, None, ()
+
+    return request_id, Opcode(opcode), args
+
+'''
+Encodes a response.
+
+Parameters:
+- request_id (int): The id of the request being answered.
+- opcode (Opcode): The operation of the request.
+- result (int | dict[Currency, float] | None): The user id, transaction id, or balances. None on error.
+- message (str | None): The error message, if any.
+
+Returns:
+- bytes: The framed response.
+'''
+def encode_response(request_id: int, opcode: Opcode, result: int | dict[Currency, float] | None, message: str | None) -> bytes:
+    if result is None:
+        return frame(HEADER.pack(request_id, STATUS_ERROR) + pack_string(message or ""))
+
+    if opcode == Opcode.BALANCE:
+        body = bytes([len(result)]) + b"".join(BALANCE_ENTRY.pack(currency_index(currency), balance)
+                                                for currency, balance in result.items())
+    else:
+        body = ID.pack(result)
+
+    return frame(HEADER.pack(request_id, STATUS_OK) + body)
+
+'''
+Decodes a response payload.
+
+Parameters:
+- payload (bytes): The payload of a response frame.
+- opcode (Opcode): The operation of the matching request.
+
+Returns:
+- tuple[int, int | dict[Currency, float] | None, str | None]: The request id, the result, and a potential error message.
+'''
+def decode_response(payload: bytes, opcode: Opcode) -> tuple[int, int | dict[Currency, float] | None, str | None]:
+    request_id, status = HEADER.unpack_from(payload)
+    offset = HEADER.size
+
+    if status == STATUS_ERROR:
+        message, _ = unpack_string(payload, offset)
+        return request_id, None, message
+
+    if opcode == Opcode.BALANCE:
+        balances = {}
+        for _ in range(payload[offset]):
+            index, balance = BALANCE_ENTRY.unpack_from(payload, offset + 1 + len(balances) * BALANCE_ENTRY.size)
+            balances[index_currency(index)] = balance
+        return request_id, balances, None
+
+    (result,) = ID.unpack_from(payload, offset)
+    return request_id, result, None
@@ -0,0 +1,73 @@
+from client import database, parallel_replay
+from client.database import create_transactions_table, create_users_table, populate_balance_cache
+from client.storage import MemoryEngine, SQLiteEngine, StorageEngine
+from concurrent.futures import ProcessPoolExecutor
+from flask import Flask
+from server.app import app as app
+from typing import Generator
+import pytest
+
+
+'''
+Runs a test module against its own storage engine, restoring the shared state afterwards.
+
+Parameters:
+- engine (StorageEngine): The storage engine private to the test module.
+'''
+def use_storage(engine: StorageEngine) -> Generator[Flask, None, None]:
+    app.config.update({"TESTING": True})
+
+    # Setup, on storage private to the test module
+    saved_storage = database.storage
+    saved_cache = dict(database.balance_cache)
+    saved_interval = database.checkpoint_interval
+
+    database.storage = engine
+    database.balance_cache.clear()
+    database.checkpoint_dirty.clear()
+    database.hot_accounts.clear()
+
+    create_users_table()
+    create_transactions_table()
+    populate_balance_cache()
+
+    yield app
+
+    # Restore the shared state
+    database.storage = saved_storage
+    database.balance_cache.clear()
+    database.balance_cache.update(saved_cache)
+    database.checkpoint_dirty.clear()
+    database.checkpoint_interval = saved_interval
+    database.hot_accounts.clear()
+
+'''
+App backed by an in-memory storage engine, for tests of behaviour common to every engine.
+'''
+@pytest.fixture(scope="module")
+def isolated_app() -> Generator[Flask, None, None]:
+    yield from use_storage(MemoryEngine())
+
+'''
+App backed by SQLite database files, for tests of checkpoints, archiving, reconciliation, and parallel replay,
+which only the SQLite engine supports.
+'''
+@pytest.fixture(scope="module")
+def sqlite_app(tmp_path_factory: pytest.TempPathFactory) -> Generator[Flask, None, None]:
+    directory = tmp_path_factory.mktemp("ledger")
+    yield from use_storage(SQLiteEngine(str(directory / "users.db"), str(directory / "transactions.db")))
+
+'''
+Records the process pools started by the parallel replay during a test, to check it really replays in worker processes.
+'''
+@pytest.fixture
+def process_pools(monkeypatch: pytest.MonkeyPatch) -> list[ProcessPoolExecutor]:
+    pools = []
+
+    class RecordedPool(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(parallel_replay, "ProcessPoolExecutor", RecordedPool)
+    return pools
@@ -0,0 +1,82 @@
+from constants import API_Query, Currency, Error_Message
+from flask import Flask
+from flask.testing import FlaskClient
+from server import admission
+from server.admission import reset_admission, take_token
+import pytest
+
+
+@pytest.fixture(scope="module")
+def client(isolated_app: Flask) -> FlaskClient:
+    client = isolated_app.test_client()
+    client.get(f'/create?{API_Query.NAME}=admission1&{API_Query.EMAIL}=admission1@email.com')
+    return client
+
+@pytest.fixture
+def limits(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(admission.rate_limits, "deposit", (0.001, 2))
+    reset_admission()
+    yield
+    reset_admission()
+
+def deposit(client: FlaskClient):
+    return client.get(f'/deposit?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+
+def test_rate_limited(client: FlaskClient, limits):
+    assert deposit(client).status_code == 200
+    assert deposit(client).status_code == 200
+
+    response = deposit(client)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.json == {API_Query.ERROR: Error_Message.RATE_LIMITED}
+
+    counters = client.get('/metrics/admission').json[API_Query.ENDPOINTS]["deposit"]
+
+    assert counters[API_Query.ADMITTED] == 2
+    assert counters[API_Query.RATE_LIMITED] == 1
+
+def test_rate_limit_is_per_endpoint(client: FlaskClient, limits):
+    deposit(client)
+    deposit(client)
+
+    response = client.get(f'/withdraw?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+
+    assert response.status_code == 200
+    assert API_Query.TRANSACTION_ID in response.json
+
+def test_shed_when_queue_full(client: FlaskClient, limits, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(admission, "max_in_flight", 0)
+    monkeypatch.setattr(admission, "max_queued", 0)
+
+    response = deposit(client)
+
+    assert response.status_code == 503
+    assert response.json == {API_Query.ERROR: Error_Message.OVERLOADED}
+    assert client.get('/metrics/admission').json[API_Query.ENDPOINTS]["deposit"][API_Query.SHED] == 1
+
+def test_shed_when_queue_wait_times_out(client: FlaskClient, limits, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(admission, "max_in_flight", 0)
+    monkeypatch.setattr(admission, "queue_timeout", 0.01)
+
+    response = deposit(client)
+
+    assert response.status_code == 503
+
+    stats = client.get('/metrics/admission').json
+
+    assert stats[API_Query.IN_FLIGHT] == 0
+    assert stats[API_Query.QUEUED] == 0
+    assert stats[API_Query.ENDPOINTS]["deposit"][API_Query.QUEUED] == 1
+    assert stats[API_Query.ENDPOINTS]["deposit"][API_Query.SHED] == 1
+
+def test_least_recently_used_bucket_evicted(limits, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(admission, "max_buckets", 2)
+
+    take_token("deposit", "10.0.0.1")
+    take_token("deposit", "10.0.0.2")
+    take_token("deposit", "10.0.0.1")
+    take_token("deposit", "10.0.0.3")
+
+    assert list(admission.buckets) == [("deposit", "10.0.0.1"), ("deposit", "10.0.0.3")]
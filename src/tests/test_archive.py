@@ -0,0 +1,80 @@
+from client import database
+from client.archive import archive_path, archive_transactions
+from client.database import populate_balance_cache
+from client.reconciler import reconcile_once
+from constants import API_Query, Currency
+from flask import Flask
+from flask.testing import FlaskClient
+import os
+import pytest
+import sqlite3
+import time
+
+
+@pytest.fixture(scope="module")
+def client(sqlite_app: Flask) -> FlaskClient:
+    database.checkpoint_interval = 3
+    client = sqlite_app.test_client()
+    for name in ("archive1", "archive2"):
+        client.get(f'/create?{API_Query.NAME}={name}&{API_Query.EMAIL}={name}@email.com')
+    return client
+
+@pytest.fixture(scope="module")
+def history(client: FlaskClient) -> dict:
+    client.get(f'/deposit?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=10.1&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=1&{API_Query.TARGET_USER_ID}=2&{API_Query.AMOUNT}=3.3&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/withdraw?{API_Query.USER_ID}=2&{API_Query.AMOUNT}=1.1&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/deposit?{API_Query.USER_ID}=2&{API_Query.AMOUNT}=7&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+    time.sleep(0.01)
+    cutoff = time.time()
+    time.sleep(0.01)
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=2&{API_Query.TARGET_USER_ID}=1&{API_Query.AMOUNT}=2&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+    client.get(f'/deposit?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=0.7&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+
+    balances_as_of_2 = client.get(f'/balance?{API_Query.USER_ID}=2&{API_Query.AS_OF}=2').json
+    cache = {user_id: dict(balances) for user_id, balances in database.balance_cache.items()}
+    archived = archive_transactions(database.storage.transactions_filename, cutoff, chunk_size=3, pause=0)
+
+    return {"cutoff": cutoff, "archived": archived, "balances_as_of_2": balances_as_of_2, "cache": cache}
+
+def test_archive_moves_old_transactions(history: dict):
+    assert history["archived"] == 4
+
+    with sqlite3.connect(database.storage.transactions_filename) as connection:
+        assert connection.execute("SELECT transaction_id FROM transactions").fetchall() == [(5,), (6,)]
+        assert connection.execute("SELECT archived_through FROM archive_state").fetchall() == [(4,)]
+
+    partition_name = time.strftime("%Y-%m", time.gmtime(history["cutoff"]))
+    assert os.path.exists(archive_path(database.storage.transactions_filename, partition_name))
+
+def test_replay_after_archive(history: dict):
+    with database.cache_mutex:
+        database.balance_cache.clear()
+    populate_balance_cache()
+
+    assert database.balance_cache == history["cache"]
+
+def test_balance_as_of_archived_transaction(client: FlaskClient, history: dict):
+    response = client.get(f'/balance?{API_Query.USER_ID}=2&{API_Query.AS_OF}=2')
+
+    assert response.json == history["balances_as_of_2"]
+
+    response = client.get(f'/balance?{API_Query.USER_ID}=2&{API_Query.AS_OF_TIME}={history["cutoff"]}')
+
+    assert response.json[API_Query.AS_OF] == 4
+    assert response.json[Currency.BITCOIN] == 3.3 - 1.1
+    assert response.json[Currency.MATIC] == 7
+
+def test_events_include_archived_transactions(client: FlaskClient, history: dict):
+    response = client.get(f'/events?{API_Query.AFTER}=0')
+
+    assert [event[API_Query.TRANSACTION_ID] for event in response.json[API_Query.EVENTS]] == [1, 2, 3, 4, 5, 6]
+
+def test_reconcile_after_archive(history: dict):
+    assert reconcile_once(duty_cycle=None) == {}
+
+def test_latest_transaction_is_never_archived(history: dict):
+    assert archive_transactions(database.storage.transactions_filename, time.time() + 60, pause=0) == 1
+
+    with sqlite3.connect(database.storage.transactions_filename) as connection:
+        assert connection.execute("SELECT transaction_id FROM transactions").fetchall() == [(6,)]
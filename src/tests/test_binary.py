@@ -0,0 +1,80 @@
+from client.ledger_client import LedgerClient
+from constants import Currency, Error_Message, Opcode
+from flask import Flask
+from server.binary import handle_payload, start_binary_server
+from server.protocol import AMOUNT_OPERATION, HEADER, STRING_LENGTH, encode_request, encode_response, decode_request, decode_response, pack_string, split_frames
+from typing import Generator
+import pytest
+import socket
+
+
+@pytest.fixture(scope="module")
+def client(isolated_app: Flask) -> Generator[LedgerClient, None, None]:
+    server = start_binary_server(port=0)
+    with LedgerClient(*server.server_address) as client:
+        yield client
+    server.shutdown()
+    server.server_close()
+
+def test_protocol_round_trip():
+    buffer = bytearray(encode_request(7, Opcode.TRANSFER, 1, 2, 3.5, Currency.MATIC) + encode_request(8, Opcode.BALANCE, 1, None))
+
+    assert [decode_request(payload) for payload in split_frames(buffer)] == [(7, Opcode.TRANSFER, (1, 2, 3.5, Currency.MATIC)),
+                                                                             (8, Opcode.BALANCE, (1, None))]
+    assert buffer == bytearray()
+
+    response = bytearray(encode_response(8, Opcode.BALANCE, {Currency.BITCOIN: 1.5, Currency.MATIC: 0}, None))
+
+    assert decode_response(split_frames(response)[0], Opcode.BALANCE) == (8, {Currency.BITCOIN: 1.5, Currency.MATIC: 0}, None)
+
+def test_split_frames_keeps_incomplete_frame():
+    frame = encode_request(1, Opcode.DEPOSIT, 1, 2.0, Currency.BITCOIN)
+    buffer = bytearray(frame + frame[:5])
+
+    assert len(split_frames(buffer)) == 1
+    assert buffer == bytearray(frame[:5])
+
+def test_operations(client: LedgerClient):
+    source_user_id, message = client.create_user("binary1", "binary1@email.com")
+    target_user_id, _ = client.create_user("binary2", "binary2@email.com")
+
+    assert message is None
+    assert client.deposit(source_user_id, 10, Currency.ETHEREUM)[0] is not None
+    assert client.transfer(source_user_id, target_user_id, 4, Currency.ETHEREUM)[0] is not None
+    assert client.withdraw(target_user_id, 1.5, Currency.ETHEREUM)[0] is not None
+
+    assert client.balance(source_user_id, Currency.ETHEREUM) == ({Currency.ETHEREUM: 6}, None)
+    assert client.balance(target_user_id) == ({Currency.BITCOIN: 0, Currency.ETHEREUM: 2.5, Currency.MATIC: 0}, None)
+
+def test_errors(client: LedgerClient):
+    assert client.withdraw(1, 1000, Currency.ETHEREUM) == (None, Error_Message.INSUFFICIENT_FUNDS_WITHDRAW)
+    assert client.balance(99) == (None, Error_Message.INVALID_SOURCE_USER)
+
+def test_pipeline(client: LedgerClient):
+    operations = [(Opcode.DEPOSIT, 1, 1, Currency.BITCOIN) for _ in range(50)]
+    operations.append((Opcode.TRANSFER, 1, 99, 1, Currency.BITCOIN))
+    operations.append((Opcode.BALANCE, 1, Currency.BITCOIN))
+
+    results = client.pipeline(operations)
+
+    transaction_ids = [transaction_id for transaction_id, _ in results[:50]]
+    assert transaction_ids == sorted(transaction_ids)
+    assert results[50] == (None, Error_Message.INVALID_TARGET_USER)
+    assert results[51] == ({Currency.BITCOIN: 50}, None)
+
+def test_bad_body_keeps_request_id():
+    bad_currency = HEADER.pack(42, Opcode.DEPOSIT) + AMOUNT_OPERATION.pack(1, 1.0, 9)
+    bad_string = HEADER.pack(43, Opcode.CREATE) + STRING_LENGTH.pack(2) + b"\xff\xfe" + pack_string("binary3@email.com")
+
+    assert decode_response(split_frames(bytearray(handle_payload(bad_currency)))[0], Opcode.DEPOSIT) == (42, None, Error_Message.INVALID_FRAME)
+    assert decode_response(split_frames(bytearray(handle_payload(bad_string)))[0], Opcode.CREATE) == (43, None, Error_Message.INVALID_FRAME)
+
+def test_unknown_response_id():
+    with socket.create_server(('localhost', 0)) as server:
+        with LedgerClient(*server.getsockname()) as client:
+            connection, _ = server.accept()
+            with connection:
+                connection.sendall(encode_response(999, Opcode.DEPOSIT, 1, None))
+
+                with pytest.raises(ValueError, match=Error_Message.INVALID_FRAME):
+                    client.deposit(1, 1, Currency.BITCOIN)
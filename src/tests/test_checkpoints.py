@@ -0,0 +1,94 @@
+from client import database, storage
+from client.checkpoints import latest_checkpoint_id
+from constants import API_Query, Currency, Error_Message
+from flask import Flask
+from flask.testing import FlaskClient
+import pytest
+import sqlite3
+import time
+
+
+@pytest.fixture(scope="module")
+def client(sqlite_app: Flask) -> FlaskClient:
+    database.checkpoint_interval = 3
+    return sqlite_app.test_client()
+
+def create_user(client: FlaskClient, name: str) -> int:
+    response = client.get(f'/create?{API_Query.NAME}={name}&{API_Query.EMAIL}={name}@email.com')
+    return response.json[API_Query.USER_ID]
+
+def deposit(client: FlaskClient, user_id: int, amount: float, currency_type: Currency) -> int:
+    response = client.get(f'/deposit?{API_Query.USER_ID}={user_id}&{API_Query.AMOUNT}={amount}&{API_Query.CURRENCY_TYPE}={currency_type}')
+    return response.json[API_Query.TRANSACTION_ID]
+
+def transfer(client: FlaskClient, source_user_id: int, target_user_id: int, amount: float, currency_type: Currency) -> int:
+    response = client.get(f'/transfer?{API_Query.SOURCE_USER_ID}={source_user_id}&{API_Query.TARGET_USER_ID}={target_user_id}&{API_Query.AMOUNT}={amount}&{API_Query.CURRENCY_TYPE}={currency_type}')
+    return response.json[API_Query.TRANSACTION_ID]
+
+def test_balance_as_of_transaction(client: FlaskClient):
+    user1 = create_user(client, "checkpoint1")
+    user2 = create_user(client, "checkpoint2")
+
+    deposit(client, user1, 10, Currency.BITCOIN)
+    transaction_id = transfer(client, user1, user2, 4, Currency.BITCOIN)
+    for _ in range(5):
+        deposit(client, user2, 1, Currency.BITCOIN)
+
+    assert latest_checkpoint_id(database.storage.transactions_filename) == 6
+
+    response = client.get(f'/balance?{API_Query.USER_ID}={user2}&{API_Query.AS_OF}={transaction_id}')
+
+    assert response.json[API_Query.AS_OF] == transaction_id
+    assert response.json[Currency.BITCOIN] == 4
+    assert response.json[Currency.ETHEREUM] == 0
+
+    response = client.get(f'/balance?{API_Query.USER_ID}={user1}&{API_Query.AS_OF}={transaction_id}&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+
+    assert response.json == {API_Query.USER_ID: user1, API_Query.AS_OF: transaction_id, Currency.BITCOIN: 6}
+
+def test_balance_as_of_matches_current_balance(client: FlaskClient):
+    for user_id in database.balance_cache:
+        response = client.get(f'/balance?{API_Query.USER_ID}={user_id}&{API_Query.AS_OF}=7')
+
+        for currency in Currency:
+            assert response.json[currency] == database.balance_cache[user_id][currency]
+
+def test_balance_as_of_time(client: FlaskClient):
+    user_id = create_user(client, "checkpoint3")
+    deposit(client, user_id, 5, Currency.MATIC)
+    timestamp = time.time()
+    time.sleep(0.01)
+    deposit(client, user_id, 7, Currency.MATIC)
+
+    response = client.get(f'/balance?{API_Query.USER_ID}={user_id}&{API_Query.AS_OF_TIME}={timestamp}')
+
+    assert response.json[Currency.MATIC] == 5
+
+    response = client.get(f'/balance?{API_Query.USER_ID}={user_id}&{API_Query.AS_OF_TIME}=0')
+
+    assert response.json[API_Query.AS_OF] == 0
+    assert response.json[Currency.MATIC] == 0
+
+def test_invalid_balance_as_of_future_transaction(client: FlaskClient):
+    response = client.get(f'/balance?{API_Query.USER_ID}=1&{API_Query.AS_OF}=1000')
+
+    assert response.status_code == 400
+    assert response.json == {API_Query.ERROR: Error_Message.INVALID_AS_OF}
+
+def test_migrate_transactions_table_adds_created_at(tmp_path):
+    filename = str(tmp_path / "legacy.db")
+    with sqlite3.connect(filename) as connection:
+        connection.execute("""CREATE TABLE transactions (
+        transaction_id integer primary key,
+        source_user_id integer not null,
+        target_user_id integer,
+        transaction_type text not null,
+        amount real not null,
+        currency_type text not null)""")
+        connection.execute("""INSERT INTO transactions(source_user_id, transaction_type, amount, currency_type)
+        VALUES(1, 'deposit', 3, 'bitcoin')""")
+
+    storage.migrate_transactions_table(filename)
+
+    with sqlite3.connect(filename) as connection:
+        assert connection.execute("SELECT created_at FROM transactions").fetchall() == [(0,)]
@@ -0,0 +1,85 @@
+from client import database, events
+from client.events import read_events, reset_events
+from constants import API_Query, Currency, Error_Message, Transaction
+from flask import Flask
+from flask.testing import FlaskClient
+from threading import Timer
+import json
+import pytest
+
+
+@pytest.fixture(scope="module")
+def client(isolated_app: Flask) -> FlaskClient:
+    client = isolated_app.test_client()
+    for name in ("events1", "events2"):
+        client.get(f'/create?{API_Query.NAME}={name}&{API_Query.EMAIL}={name}@email.com')
+    return client
+
+def deposit(client: FlaskClient, user_id: int, amount: float) -> int:
+    response = client.get(f'/deposit?{API_Query.USER_ID}={user_id}&{API_Query.AMOUNT}={amount}&{API_Query.CURRENCY_TYPE}={Currency.ETHEREUM}')
+    return response.json[API_Query.TRANSACTION_ID]
+
+def test_events_after_cursor(client: FlaskClient):
+    deposit(client, 1, 10)
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=1&{API_Query.TARGET_USER_ID}=2&{API_Query.AMOUNT}=4&{API_Query.CURRENCY_TYPE}={Currency.ETHEREUM}')
+    client.get(f'/withdraw?{API_Query.USER_ID}=2&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.ETHEREUM}')
+
+    response = client.get(f'/events?{API_Query.AFTER}=1')
+
+    assert response.json[API_Query.CURSOR] == 3
+    assert [event[API_Query.TRANSACTION_TYPE] for event in response.json[API_Query.EVENTS]] == [Transaction.TRANSFER, Transaction.WITHDRAW]
+    assert response.json[API_Query.EVENTS][0][API_Query.TARGET_USER_ID] == 2
+
+def test_events_limit(client: FlaskClient):
+    response = client.get(f'/events?{API_Query.AFTER}=0&{API_Query.LIMIT}=2')
+
+    assert response.json[API_Query.CURSOR] == 2
+    assert len(response.json[API_Query.EVENTS]) == 2
+
+def test_events_invalid_limit(client: FlaskClient):
+    for limit in (0, -2):
+        response = client.get(f'/events?{API_Query.AFTER}=0&{API_Query.LIMIT}={limit}')
+
+        assert response.status_code == 400
+        assert response.json == {API_Query.ERROR: Error_Message.INVALID_LIMIT}
+
+def test_events_negative_timeout(client: FlaskClient):
+    response = client.get(f'/events?{API_Query.AFTER}=1000&{API_Query.TIMEOUT}=-5')
+
+    assert response.json == {API_Query.EVENTS: [], API_Query.CURSOR: 1000}
+
+def test_events_long_poll(client: FlaskClient):
+    timer = Timer(0.05, deposit, (client, 1, 2))
+    timer.start()
+
+    response = client.get(f'/events?{API_Query.AFTER}=3&{API_Query.TIMEOUT}=5')
+    timer.join()
+
+    assert response.json[API_Query.CURSOR] == 4
+    assert response.json[API_Query.EVENTS][0][API_Query.AMOUNT] == 2
+
+def test_events_timeout(client: FlaskClient):
+    response = client.get(f'/events?{API_Query.AFTER}=4&{API_Query.TIMEOUT}=0.01')
+
+    assert response.json == {API_Query.EVENTS: [], API_Query.CURSOR: 4}
+
+def test_lagging_consumer_reads_from_database(client: FlaskClient):
+    reset_events(4, size=2)
+    try:
+        for _ in range(3):
+            deposit(client, 1, 1)
+
+        assert events.event_floor == 5
+        assert [event[API_Query.TRANSACTION_ID] for event in read_events(database.storage, 0, 10, 0)] == [1, 2, 3, 4, 5, 6, 7]
+        assert [event[API_Query.TRANSACTION_ID] for event in read_events(database.storage, 5, 10, 0)] == [6, 7]
+    finally:
+        reset_events(7, size=10000)
+
+def test_event_stream_resumes_from_last_event_id(client: FlaskClient):
+    response = client.get('/events/stream', headers={"Last-Event-ID": "6"}, buffered=False)
+    chunk = next(iter(response.response))
+    response.close()
+
+    event_id, data, _ = chunk.decode().split("\n", 2)
+    assert event_id == "id: 7"
+    assert json.loads(data.removeprefix("data: "))[API_Query.TRANSACTION_ID] == 7
@@ -0,0 +1,75 @@
+from client import history
+from client.history import history_stats
+from constants import API_Query, Currency, Error_Message, Transaction
+from flask import Flask
+from flask.testing import FlaskClient
+import pytest
+
+
+@pytest.fixture(scope="module")
+def client(isolated_app: Flask) -> FlaskClient:
+    saved_budget = history.history_budget
+    client = isolated_app.test_client()
+
+    for name in ("history1", "history2", "history3"):
+        client.get(f'/create?{API_Query.NAME}={name}&{API_Query.EMAIL}={name}@email.com')
+    client.get(f'/deposit?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=10&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=1&{API_Query.TARGET_USER_ID}=2&{API_Query.AMOUNT}=4&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/deposit?{API_Query.USER_ID}=3&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+
+    yield client
+
+    history.history_budget = saved_budget
+    history.reset_history()
+
+def transaction_ids(client: FlaskClient, user_id: int, limit: int | None = None) -> list[int]:
+    url = f'/history?{API_Query.USER_ID}={user_id}' + (f'&{API_Query.LIMIT}={limit}' if limit else '')
+    return [transaction[API_Query.TRANSACTION_ID] for transaction in client.get(url).json[API_Query.TRANSACTIONS]]
+
+def test_history(client: FlaskClient):
+    response = client.get(f'/history?{API_Query.USER_ID}=2')
+
+    assert response.json[API_Query.USER_ID] == 2
+    assert response.json[API_Query.TRANSACTIONS] == [{API_Query.TRANSACTION_ID: 2,
+                                                      API_Query.TRANSACTION_TYPE: Transaction.TRANSFER,
+                                                      API_Query.SOURCE_USER_ID: 1,
+                                                      API_Query.TARGET_USER_ID: 2,
+                                                      API_Query.AMOUNT: 4,
+                                                      API_Query.CURRENCY_TYPE: Currency.BITCOIN,
+                                                      API_Query.CREATED_AT: response.json[API_Query.TRANSACTIONS][0][API_Query.CREATED_AT]}]
+    assert transaction_ids(client, 1) == [1, 2]
+    assert transaction_ids(client, 1, limit=1) == [2]
+
+def test_history_cache_follows_writes(client: FlaskClient):
+    hits = history_stats()[API_Query.HITS]
+    client.get(f'/withdraw?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+
+    assert transaction_ids(client, 1) == [1, 2, 4]
+    assert history_stats()[API_Query.HITS] == hits + 1
+
+def test_history_invalid_limit(client: FlaskClient):
+    for limit in (0, -1):
+        response = client.get(f'/history?{API_Query.USER_ID}=1&{API_Query.LIMIT}={limit}')
+
+        assert response.status_code == 400
+        assert response.json == {API_Query.ERROR: Error_Message.INVALID_LIMIT}
+
+def test_history_missing_user(client: FlaskClient):
+    response = client.get(f'/history?{API_Query.USER_ID}=999')
+
+    assert response.json == {API_Query.ERROR: Error_Message.INVALID_SOURCE_USER}
+
+def test_history_eviction(client: FlaskClient):
+    history.reset_history()
+    transaction_ids(client, 1)
+    history.history_budget = history.history_bytes + 1
+    evictions = history_stats()[API_Query.EVICTIONS]
+
+    transaction_ids(client, 3)
+
+    stats = client.get('/metrics/history').json
+    assert stats[API_Query.USERS] == 1
+    assert stats[API_Query.EVICTIONS] == evictions + 1
+    assert stats[API_Query.BYTES] <= stats[API_Query.BUDGET]
+    assert 1 not in history.history_cache
+    assert transaction_ids(client, 1) == [1, 2, 4]
@@ -0,0 +1,59 @@
+from client import database, events
+from client.checkpoints import latest_checkpoint_id, load_balance_as_of
+from client.database import commit_transfers, deposit_transaction, insert_user, transfer_transaction
+from concurrent.futures import ThreadPoolExecutor
+from constants import API_Query, Currency, Error_Message
+from flask import Flask
+import pytest
+
+
+@pytest.fixture(scope="module")
+def app(sqlite_app: Flask) -> Flask:
+    database.checkpoint_interval = 7
+    return sqlite_app
+
+def test_hot_account_transfers_keep_overdraft_guarantee(app: Flask):
+    wallet, _ = insert_user("hot_wallet", "hot_wallet@email.com")
+    customers = [insert_user(f"customer{index}", f"customer{index}@email.com")[0] for index in range(5)]
+    database.hot_accounts.add(wallet)
+    deposit_transaction(wallet, 100, Currency.BITCOIN)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda index: transfer_transaction(wallet, customers[index % 5], 3, Currency.BITCOIN),
+                                    range(50)))
+
+    succeeded = [id for id, msg in results if msg is None]
+    assert len(succeeded) == 33
+    assert len(set(succeeded)) == 33
+    assert [msg for id, msg in results if id is None] == [Error_Message.INSUFFICIENT_FUNDS_TRANSFER] * 17
+    assert database.balance_cache[wallet][Currency.BITCOIN] == 1
+    assert sum(database.balance_cache[customer][Currency.BITCOIN] for customer in customers) == 99
+
+def test_hot_account_transfers_are_replayed_exactly(app: Flask):
+    filename = database.storage.transactions_filename
+    latest = max(event[API_Query.TRANSACTION_ID] for event in events.event_buffer)
+
+    assert [event[API_Query.TRANSACTION_ID] for event in events.event_buffer] == list(range(1, latest + 1))
+    assert latest_checkpoint_id(filename) > 0
+    for user_id, balances in database.balance_cache.items():
+        assert load_balance_as_of(filename, user_id, latest) == balances
+
+def test_hot_account_transfer_errors(app: Flask):
+    wallet = next(iter(database.hot_accounts))
+
+    assert transfer_transaction(wallet, 999, 1, Currency.BITCOIN) == (None, Error_Message.INVALID_TARGET_USER)
+    assert transfer_transaction(999, wallet, 1, Currency.BITCOIN) == (None, Error_Message.INVALID_SOURCE_USER)
+
+def test_malformed_transfer_only_fails_itself(app: Flask):
+    wallet = next(iter(database.hot_accounts))
+    customer = insert_user("customer_group", "customer_group@email.com")[0]
+    deposit_transaction(wallet, 2, Currency.ETHEREUM)
+    batch = [[(wallet, customer, 1, Currency.ETHEREUM), None],
+             [(wallet, customer, 1, None), None],
+             [(wallet, customer, 1, Currency.ETHEREUM), None]]
+
+    commit_transfers(batch)
+
+    assert batch[0][1][1] is None and batch[2][1][1] is None
+    assert batch[1][1] == (None, Error_Message.INVALID_CURRENCY)
+    assert database.balance_cache[customer][Currency.ETHEREUM] == 2
@@ -200,6 +200,16 @@ def test_invalid_deposit_with_invalid_user(client: FlaskClient):
     assert API_Query.AMOUNT not in response.json
     assert API_Query.CURRENCY_TYPE not in response.json
 
+def test_invalid_amounts(client: FlaskClient):
+    for amount in ("nan", "inf", "-inf"):
+        for url in (f'/deposit?{API_Query.USER_ID}=1&{API_Query.AMOUNT}={amount}&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}',
+                    f'/transfer?{API_Query.SOURCE_USER_ID}=1&{API_Query.TARGET_USER_ID}=2&{API_Query.AMOUNT}={amount}&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}',
+                    f'/withdraw?{API_Query.USER_ID}=1&{API_Query.AMOUNT}={amount}&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}'):
+            response = client.get(url)
+
+            assert response.status_code == 400
+            assert response.json == {API_Query.ERROR: Error_Message.INVALID_AMOUNT}
+
 
 def verify_transfer_response(user_response_json: dict[str, str], source_user_id: int, target_user_id: int, amount: float, currency_type: Currency):
     assert user_response_json[API_Query.SOURCE_USER_ID] == source_user_id
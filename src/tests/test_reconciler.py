@@ -0,0 +1,82 @@
+from client import database, reconciler
+from client.reconciler import reconcile_once
+from constants import API_Query, Currency, Transaction
+from flask import Flask
+from flask.testing import FlaskClient
+import pytest
+import sqlite3
+
+
+@pytest.fixture(scope="module")
+def client(sqlite_app: Flask) -> FlaskClient:
+    return sqlite_app.test_client()
+
+@pytest.fixture(scope="module")
+def users(client: FlaskClient) -> tuple[int, int]:
+    user_ids = []
+    for name in ("reconcile1", "reconcile2"):
+        response = client.get(f'/create?{API_Query.NAME}={name}&{API_Query.EMAIL}={name}@email.com')
+        user_ids.append(response.json[API_Query.USER_ID])
+
+    source_user_id, target_user_id = user_ids
+    client.get(f'/deposit?{API_Query.USER_ID}={source_user_id}&{API_Query.AMOUNT}=20&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}={source_user_id}&{API_Query.TARGET_USER_ID}={target_user_id}&{API_Query.AMOUNT}=5.5&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/withdraw?{API_Query.USER_ID}={target_user_id}&{API_Query.AMOUNT}=1.25&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+
+    return source_user_id, target_user_id
+
+def test_withdraw_is_recorded_as_withdraw(users: tuple[int, int]):
+    with sqlite3.connect(database.storage.transactions_filename) as connection:
+        rows = connection.execute("SELECT transaction_type FROM transactions ORDER BY transaction_id").fetchall()
+
+    assert rows == [(Transaction.DEPOSIT,), (Transaction.TRANSFER,), (Transaction.WITHDRAW,)]
+
+def test_reconcile_without_drift(users: tuple[int, int]):
+    assert reconcile_once(chunk_size=2, duty_cycle=None) == {}
+    assert reconciler.reconciled_through == 3
+
+def test_reconcile_incrementally(client: FlaskClient, users: tuple[int, int]):
+    source_user_id, _ = users
+    client.get(f'/deposit?{API_Query.USER_ID}={source_user_id}&{API_Query.AMOUNT}=3&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+
+    assert reconcile_once(chunk_size=2, duty_cycle=None) == {}
+    assert reconciler.reconciled_through == 4
+    assert reconciler.ledger_balances[source_user_id][Currency.MATIC] == 3
+
+def test_reconcile_reports_drift(users: tuple[int, int]):
+    _, target_user_id = users
+    with database.cache_mutex:
+        database.balance_cache[target_user_id][Currency.BITCOIN] += 100
+
+    drift = reconcile_once(duty_cycle=None)
+
+    assert drift == {target_user_id: {Currency.BITCOIN: (104.25, 4.25)}}
+    assert database.balance_cache[target_user_id][Currency.BITCOIN] == 104.25
+
+def test_reconcile_repairs_drift(users: tuple[int, int]):
+    _, target_user_id = users
+
+    drift = reconcile_once(duty_cycle=None, repair=True)
+
+    assert drift == {target_user_id: {Currency.BITCOIN: (104.25, 4.25)}}
+    assert database.balance_cache[target_user_id][Currency.BITCOIN] == 4.25
+    assert reconcile_once(duty_cycle=None) == {}
+
+def test_locked_catch_up_is_bounded(client: FlaskClient, users: tuple[int, int], monkeypatch: pytest.MonkeyPatch):
+    source_user_id, _ = users
+    for _ in range(5):
+        client.get(f'/deposit?{API_Query.USER_ID}={source_user_id}&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.ETHEREUM}')
+
+    catch_up = reconciler.catch_up
+    calls = []
+
+    def recording_catch_up(storage, high_water: int, chunk_size: int, duty_cycle: float | None):
+        calls.append((high_water - reconciler.reconciled_through, duty_cycle))
+        if len(calls) > 1:
+            catch_up(storage, high_water, chunk_size, duty_cycle)
+
+    monkeypatch.setattr(reconciler, "catch_up", recording_catch_up)
+
+    assert reconcile_once(chunk_size=2, duty_cycle=1) == {}
+    assert calls[0] == (5, 1)
+    assert all(lag <= 2 for lag, duty_cycle in calls if duty_cycle is None)
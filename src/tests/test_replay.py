@@ -0,0 +1,88 @@
+from client import database
+from client.database import deposit_transaction, insert_user, populate_balance_cache
+from client.parallel_replay import replay_transactions
+from client.replay import apply_deltas, apply_to_ledger, record_deltas
+from concurrent.futures import ProcessPoolExecutor
+from constants import Currency, Transaction
+from flask import Flask
+import pytest
+import random
+
+
+@pytest.fixture(scope="module")
+def user_ids(sqlite_app: Flask) -> list[int]:
+    storage = database.storage
+    user_ids = [storage.insert_user(f"replay{index}", f"replay{index}@email.com") for index in range(5)]
+
+    random.seed(7)
+    amounts = [0.1, 1e-9, 3.3, 1e9, 2 ** -40, 123.456]
+    rows = []
+    for _ in range(400):
+        source_id, target_id = random.sample(user_ids, 2)
+        transaction_type = random.choice(list(Transaction))
+        rows.append((source_id, target_id if transaction_type == Transaction.TRANSFER else None, transaction_type,
+                     random.choice(amounts), random.choice(list(Currency)), 0.0))
+    storage.append_transactions(rows)
+
+    return user_ids
+
+def test_replay_matches_sequential_sums(user_ids: list[int]):
+    rows = database.storage.scan_transactions(0)
+    expected: dict[int, dict[Currency, float]] = {}
+    for row in rows:
+        apply_to_ledger(expected, row)
+
+    balances: dict[int, dict[Currency, float]] = {}
+    replay_transactions(database.storage, balances, 0, len(rows))
+
+    assert balances == expected
+
+def test_parallel_replay_matches_serial(user_ids: list[int]):
+    latest = database.storage.latest_transaction_id()
+    serial, chunked, parallel = {}, {}, {}
+
+    replay_transactions(database.storage, serial, 0, latest)
+    replay_transactions(database.storage, chunked, 0, latest, chunk_size=37)
+    replay_transactions(database.storage, parallel, 0, latest, workers=2, chunk_size=37)
+
+    assert serial == chunked == parallel
+
+def test_deltas_keep_transaction_order():
+    deltas: dict[tuple[int, str], list[float]] = {}
+    for row in [(1, 1, None, Transaction.DEPOSIT, 0.1, Currency.BITCOIN), (2, 1, 2, Transaction.TRANSFER, 0.2, Currency.BITCOIN),
+                (3, 2, None, Transaction.WITHDRAW, 0.05, Currency.BITCOIN)]:
+        record_deltas(deltas, row)
+
+    assert deltas == {(1, Currency.BITCOIN): [0.1, -0.2], (2, Currency.BITCOIN): [0.2, -0.05]}
+
+    balances = {1: {Currency.BITCOIN: 1.0}}
+    apply_deltas(balances, deltas)
+
+    assert balances[1][Currency.BITCOIN] == 1.0 + 0.1 - 0.2
+    assert balances[2][Currency.BITCOIN] == 0.2 - 0.05
+
+def test_populate_matches_live_cache(user_ids: list[int]):
+    populate_balance_cache()
+    user_id, _ = insert_user("replay_live", "replay_live@email.com")
+    for _ in range(10):
+        deposit_transaction(user_id, 0.1, Currency.ETHEREUM)
+    live = {user_id: dict(balances) for user_id, balances in database.balance_cache.items()}
+
+    assert live[user_id][Currency.ETHEREUM] == sum([0.1] * 10)
+
+    populate_balance_cache()
+
+    assert database.balance_cache == live
+
+def test_populate_with_workers(user_ids: list[int], monkeypatch: pytest.MonkeyPatch,
+                               process_pools: list[ProcessPoolExecutor]):
+    monkeypatch.setattr(database, "replay_workers", 2)
+    monkeypatch.setattr(database, "replay_chunk_size", 37)
+    populate_balance_cache()
+    assert process_pools
+    parallel = {user_id: dict(balances) for user_id, balances in database.balance_cache.items()}
+
+    monkeypatch.setattr(database, "replay_workers", 1)
+    populate_balance_cache()
+
+    assert parallel == database.balance_cache
@@ -0,0 +1,73 @@
+from client import database
+from client.database import populate_balance_cache
+from client.storage import MemoryEngine, SQLiteEngine, StorageEngine
+from constants import API_Query, Currency, Transaction
+from flask import Flask
+from flask.testing import FlaskClient
+import pytest
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def engine(request: pytest.FixtureRequest, tmp_path) -> StorageEngine:
+    if request.param == "sqlite":
+        engine = SQLiteEngine(str(tmp_path / "users.db"), str(tmp_path / "transactions.db"))
+    else:
+        engine = MemoryEngine()
+    engine.create_users_table()
+    engine.create_transactions_table()
+    return engine
+
+@pytest.fixture(scope="module")
+def client(isolated_app: Flask) -> FlaskClient:
+    return isolated_app.test_client()
+
+def test_engine_is_abstract():
+    with pytest.raises(TypeError):
+        StorageEngine()
+
+def test_engine_users(engine: StorageEngine):
+    assert [engine.insert_user("storage1", "storage1@email.com"), engine.insert_user("storage2", "storage2@email.com")] == [1, 2]
+    assert engine.user_ids() == [1, 2]
+
+    with pytest.raises(Exception):
+        engine.insert_user("storage3", "storage1@email.com")
+
+def test_engine_transactions(engine: StorageEngine):
+    rows = [(1, None, Transaction.DEPOSIT, 10, Currency.BITCOIN, 100.0),
+            (1, 2, Transaction.TRANSFER, 4, Currency.BITCOIN, 200.0),
+            (2, None, Transaction.WITHDRAW, 1.5, Currency.BITCOIN, 300.0)]
+
+    assert engine.append_transactions(rows) == [1, 2, 3]
+    assert engine.latest_transaction_id() == 3
+    assert engine.scan_transactions(0) == [(index + 1, *row) for index, row in enumerate(rows)]
+    assert [row[0] for row in engine.scan_transactions(1, limit=1)] == [2]
+    assert [row[0] for row in engine.scan_transactions(0, 2)] == [1, 2]
+    assert engine.transaction_id_at(250.0) == 2
+    assert engine.transaction_id_at(50.0) == 0
+
+    assert engine.load_balances([1, 2]) == {1: {Currency.BITCOIN: 6, Currency.ETHEREUM: 0, Currency.MATIC: 0},
+                                            2: {Currency.BITCOIN: 2.5, Currency.ETHEREUM: 0, Currency.MATIC: 0}}
+    assert engine.load_balances([2], 2)[2][Currency.BITCOIN] == 4
+
+def test_ledger_on_memory_engine(client: FlaskClient):
+    for name in ("memory1", "memory2"):
+        client.get(f'/create?{API_Query.NAME}={name}&{API_Query.EMAIL}={name}@email.com')
+    client.get(f'/deposit?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=10&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=1&{API_Query.TARGET_USER_ID}=2&{API_Query.AMOUNT}=3&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+
+    response = client.get(f'/balance?{API_Query.USER_ID}=2&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+    assert response.json[Currency.MATIC] == 3
+
+    response = client.get(f'/balance?{API_Query.USER_ID}=1&{API_Query.AS_OF}=1')
+    assert response.json[Currency.MATIC] == 10
+
+    response = client.get(f'/events?{API_Query.AFTER}=0')
+    assert [event[API_Query.TRANSACTION_TYPE] for event in response.json[API_Query.EVENTS]] == [Transaction.DEPOSIT, Transaction.TRANSFER]
+
+def test_memory_engine_replays_into_cache(client: FlaskClient):
+    expected = {user_id: dict(balances) for user_id, balances in database.balance_cache.items()}
+
+    database.balance_cache.clear()
+    populate_balance_cache()
+
+    assert database.balance_cache == expected
@@ -0,0 +1,138 @@
+from client import database, events
+from client.checkpoints import load_balances
+from client.database import start_cache_warmup, warm_balance_cache
+from concurrent.futures import ProcessPoolExecutor
+from constants import API_Query, Currency, Error_Message
+from flask import Flask
+from flask.testing import FlaskClient
+from threading import Event
+import pytest
+import time
+
+
+@pytest.fixture(scope="module")
+def client(sqlite_app: Flask) -> FlaskClient:
+    database.checkpoint_interval = 2
+    client = sqlite_app.test_client()
+
+    for name in ("warmup1", "warmup2", "warmup3"):
+        client.get(f'/create?{API_Query.NAME}={name}&{API_Query.EMAIL}={name}@email.com')
+    client.get(f'/deposit?{API_Query.USER_ID}=1&{API_Query.AMOUNT}=12&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=1&{API_Query.TARGET_USER_ID}=2&{API_Query.AMOUNT}=5&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/withdraw?{API_Query.USER_ID}=2&{API_Query.AMOUNT}=1.5&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+    client.get(f'/deposit?{API_Query.USER_ID}=3&{API_Query.AMOUNT}=8&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+    client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=3&{API_Query.TARGET_USER_ID}=1&{API_Query.AMOUNT}=2&{API_Query.CURRENCY_TYPE}={Currency.MATIC}')
+
+    return client
+
+@pytest.fixture
+def restarted(client: FlaskClient) -> dict[int, dict[Currency, float]]:
+    with database.cache_mutex:
+        balances = {user_id: dict(user_balances) for user_id, user_balances in database.balance_cache.items()}
+        database.balance_cache.clear()
+        database.cache_ready.clear()
+    return balances
+
+def test_liveness(client: FlaskClient):
+    response = client.get('/health/live')
+
+    assert response.status_code == 200
+    assert response.json == {API_Query.STATUS: "alive"}
+
+def test_requests_while_warming(client: FlaskClient, restarted: dict[int, dict[Currency, float]]):
+    with database.cache_mutex:
+        database.balance_cache.update(load_balances(database.storage.transactions_filename, [1]))
+
+    response = client.get(f'/balance?{API_Query.USER_ID}=1')
+
+    assert response.status_code == 200
+    for currency in Currency:
+        assert response.json[currency] == restarted[1][currency]
+
+    response = client.get(f'/transfer?{API_Query.SOURCE_USER_ID}=1&{API_Query.TARGET_USER_ID}=2&{API_Query.AMOUNT}=1&{API_Query.CURRENCY_TYPE}={Currency.BITCOIN}')
+
+    assert response.status_code == 503
+    assert response.json == {API_Query.ERROR: Error_Message.CACHE_WARMING}
+
+    response = client.get('/health/ready')
+
+    assert response.status_code == 503
+    assert response.json[API_Query.READY] is False
+
+    warm_balance_cache(batch_size=2)
+
+def test_warm_balance_cache(client: FlaskClient, restarted: dict[int, dict[Currency, float]]):
+    warm_balance_cache(batch_size=2)
+
+    assert database.balance_cache == restarted
+
+    response = client.get('/health/ready')
+
+    assert response.status_code == 200
+    assert response.json == {API_Query.READY: True, API_Query.LOADED_USERS: 3, API_Query.TOTAL_USERS: 3}
+
+    response = client.get(f'/balance?{API_Query.USER_ID}=4')
+
+    assert response.status_code == 200
+    assert response.json == {API_Query.ERROR: Error_Message.INVALID_SOURCE_USER}
+
+def test_events_while_warming(client: FlaskClient, restarted: dict[int, dict[Currency, float]],
+                              monkeypatch: pytest.MonkeyPatch):
+    events.reset_events(0)
+    monkeypatch.setattr(database, "warm_balance_cache", lambda batch_size: None)
+    start_cache_warmup().join()
+
+    response = client.get(f'/events?{API_Query.AFTER}=0&{API_Query.TIMEOUT}=0')
+
+    assert [event[API_Query.TRANSACTION_ID] for event in response.json[API_Query.EVENTS]] == [1, 2, 3, 4, 5]
+
+    monkeypatch.undo()
+    warm_balance_cache(batch_size=2)
+
+def test_warmup_retries_after_failure(client: FlaskClient, restarted: dict[int, dict[Currency, float]],
+                                      monkeypatch: pytest.MonkeyPatch):
+    failing = Event()
+    failing.set()
+    user_ids = database.storage.user_ids
+
+    def flaky_user_ids() -> list[int]:
+        if failing.is_set():
+            raise Exception("database is locked")
+        return user_ids()
+
+    monkeypatch.setattr(database.storage, "user_ids", flaky_user_ids)
+    monkeypatch.setattr(database, "warmup_retry_delay", 0.01)
+    thread = start_cache_warmup()
+
+    for _ in range(100):
+        if API_Query.ERROR in database.warmup_progress:
+            break
+        time.sleep(0.01)
+    response = client.get('/health/ready')
+
+    assert response.status_code == 503
+    assert response.json[API_Query.ERROR] == "database is locked"
+
+    failing.clear()
+    thread.join(timeout=5)
+    response = client.get('/health/ready')
+
+    assert response.status_code == 200
+    assert API_Query.ERROR not in response.json
+    assert database.balance_cache == restarted
+
+def test_warm_balance_cache_with_workers(client: FlaskClient, restarted: dict[int, dict[Currency, float]],
+                                         monkeypatch: pytest.MonkeyPatch, process_pools: list[ProcessPoolExecutor]):
+    monkeypatch.setattr(database, "replay_workers", 2)
+    monkeypatch.setattr(database, "replay_chunk_size", 2)
+    with database.cache_mutex:
+        database.balance_cache.update(load_balances(database.storage.transactions_filename, [1]))
+        database.balance_cache[1][Currency.ETHEREUM] = 1
+
+    warm_balance_cache()
+
+    assert process_pools
+    assert database.balance_cache[1][Currency.ETHEREUM] == 1
+    database.balance_cache[1][Currency.ETHEREUM] = restarted[1][Currency.ETHEREUM]
+    assert database.balance_cache == restarted
+    assert client.get('/health/ready').status_code == 200